@@ -1,130 +1,80 @@
 import streamlit as st
 import pandas as pd
-import math
-import plotly.express as px
+from datetime import datetime
+
+from thai_election.figures import arc_figure, pie_figure
+from thai_election.history import default_history
+from thai_election.incremental import shared_engine
+from thai_election.ingest import ensure_background_poller
+from thai_election.loader import NO_INFO, load_election_data
+from thai_election.model import election_model
+from thai_election.parties import party_index
+from thai_election.profiling import render_panel, span
+from thai_election.projection import project
 
 st.set_page_config(page_title="Thailand Election 2026", layout="wide")
+rerun_span = span("parliament/rerun")
 
 run_live = st.checkbox("Run Live Update", value=False)
-# 1. Load Data
-# @st.cache_data
-def load_election_data():
-    sheet_id = "1fm_6pbiXU6jBwHtu13Yuqh_XgQY-AW03"
-    province_gid = "858321697"
-    partylist_gid = "374730466"
-
-    def process_sheet(gid):
-        if run_live:
-            url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid={gid}"
-            df = pd.read_csv(url, header=1)
-        else:
-            df = pd.read_excel(f"Th election Province list.xlsx", header=1, sheet_name=gid)
-        non_party_cols = ['Province', 'Region', 'Constituency_ID', 'Province (English)', 'District']
-        party_cols = [c for c in df.columns if c not in non_party_cols and "Unnamed" not in c]
-        for col in party_cols:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-        row_max = df[party_cols].max(axis=1)
-        row_idxmax = df[party_cols].idxmax(axis=1)
-
-        # Only assign a winner if the max vote is > 0; otherwise, leave blank
-        df['District_Winner'] = row_idxmax.where(row_max > 0, "NO INFORMATION YET")
-        df['Winning_Votes'] = row_max
-        return df, party_cols
-
-    province_df, _ = process_sheet(province_gid if run_live else "Province")
-    partylist_df, party_cols = process_sheet(partylist_gid if run_live else "Party List")
-    return province_df, partylist_df, party_cols
-
-province_df, partylist_df, party_cols = load_election_data()
-
-# 2. Seat Calculations
-constituency_winners = province_df['District_Winner'].value_counts()
-total_party_votes = partylist_df[party_cols].sum()
-total_votes_sum = total_party_votes.sum()
-
-# Initialize calculation dataframe for the Party List breakdown
-pl_calc = pd.DataFrame({
-    "Total Votes": total_party_votes,
-})
-
-if total_votes_sum > 0:
-    quota = total_votes_sum / 100
-    pl_calc["Quotient"] = pl_calc["Total Votes"] / quota
-    pl_calc["Base Seats"] = pl_calc["Quotient"].apply(lambda x: int(x))
-    pl_calc["Remainder"] = pl_calc["Quotient"] % 1
-    
-    # Identify which parties get the extra seats
-    extra_seats_needed = 100 - pl_calc["Base Seats"].sum()
-    top_remainder_indices = pl_calc["Remainder"].nlargest(int(extra_seats_needed)).index
-    
-    pl_calc["Extra Seat"] = 0
-    pl_calc.loc[top_remainder_indices, "Extra Seat"] = 1
-    pl_calc["Final PL Seats"] = pl_calc["Base Seats"] + pl_calc["Extra Seat"]
+if run_live:
+    # One poller per process keeps the local snapshot store fresh for every session
+    ensure_background_poller()
+# 1. Load Data (cached per process and shared by every session)
+with span("parliament/load"):
+    province_df, partylist_df, party_cols = load_election_data(live=run_live)
+
+# Scrub back through the night using the snapshot history (live mode only)
+replay = None
+if run_live:
+    history_times = default_history().timestamps()
+    if len(history_times) > 1:
+        replay_at = st.sidebar.select_slider(
+            "⏪ Replay the count",
+            options=history_times,
+            value=history_times[-1],
+            format_func=lambda ts: datetime.fromtimestamp(ts).strftime("%H:%M:%S"),
+        )
+        if replay_at != history_times[-1]:
+            replay = default_history().replay(replay_at)
+
+# 2. Seat Calculations (only constituencies that changed since the last snapshot are recomputed)
+seat_math_span = span("parliament/seat_math")
+if replay is not None:
+    province_df, partylist_df, party_cols = replay.province_df, replay.partylist_df, replay.party_cols
+    constituency_winners = province_df['District_Winner'].value_counts()
+    pl_calc = replay.pl_calc
+    summary = replay.summary
 else:
-    pl_calc["Final PL Seats"] = 0
-
-# Final summary for the Arc Chart
-summary = pd.DataFrame({
-    "Constituency Seats": constituency_winners, 
-    "Party List": pl_calc["Final PL Seats"]
-}).fillna(0).astype(int)
-summary["Total"] = summary["Constituency Seats"] + summary["Party List"]
-summary = summary[summary["Total"] > 0].sort_values("Total", ascending=False)
-
-# 3. Visualization Logic (The Arc)
-def create_parliament_data(summary_df, province_df, rows=10, radius=10):
-    all_seats = []
-    for party in summary_df.index:
-        party_districts = province_df[province_df['District_Winner'] == party]
-        for _, row in party_districts.iterrows():
-            all_seats.append({"Party": party, "Info": f"{row['Province (English)']}, {row['District']}"})
-        pl_count = summary_df.loc[party, "Party List"]
-        for _ in range(pl_count):
-            all_seats.append({"Party": party, "Info": "Party List"})
-    
-    points = []
-    for i, seat in enumerate(all_seats):
-        row = i % rows
-        angle = math.pi * (i / 500)
-        r = radius + (row * 0.7)
-        points.append({
-            "x": r * math.cos(math.pi - angle),
-            "y": r * math.sin(math.pi - angle),
-            "Party": seat["Party"],
-            "Location": seat["Info"]
-        })
-    return pd.DataFrame(points)
+    # One published result object, so another session's update can't mix old and new tables
+    result = shared_engine("live" if run_live else "xlsx").update(province_df, partylist_df, party_cols)
+    constituency_winners = result.constituency_seats
+    pl_calc = result.pl_calc
+    summary = result.summary
+total_votes_sum = pl_calc["Total Votes"].sum()
+quota = total_votes_sum / 100
+seat_math_span.end()
 
 # 4. Display
 st.title("🏛️ Thailand Parliament (500 Seats)")
-
-thai_colors = {
-    "เพื่อไทย": "#DF0000", "ประชาชน": "#FF6600",
-    "ภูมิใจไทย": "#00008B", "ประชาธิปัตย์": "#00BFFF",
-    "รวมไทยสร้างชาติ": "#000073", "พลังประชารัฐ": "#0000FF",
-    "ชาติไทยพัฒนา": "#FF69B4", "ประชาชาติ": "#8B4513",
-    "NO INFORMATION YET": "#D3D3D3",
-    "พรรคเศรษฐกิจ":"#FFD700","พรรคกล้าธรรม":"#00A651"
-}
-
-coords = create_parliament_data(summary, province_df)
-fig = px.scatter(
-    coords, x="x", y="y", color="Party", 
-    color_discrete_map=thai_colors,
-    custom_data=["Party", "Location"],
-    category_orders={"Party": summary.index.tolist()} 
-)
-fig.update_traces(
-    hovertemplate="<b>%{customdata[0]}</b><br>%{customdata[1]}<extra></extra>",
-    marker=dict(size=14, line=dict(width=1, color='white'))
-)
-fig.update_layout(
-    xaxis=dict(visible=False), yaxis=dict(visible=False),
-    plot_bgcolor="rgba(0,0,0,0)", height=600,
-    legend=dict(orientation="h", y=-0.1, x=0.5, xanchor="center")
-)
-
-st.plotly_chart(fig, width="stretch")
+if replay is not None:
+    st.caption(f"⏪ Showing results as of {datetime.fromtimestamp(replay.timestamp):%H:%M:%S}")
+elif run_live and result.changes.flips:
+    with st.expander(f"🔄 {len(result.changes.flips)} district(s) changed hands in the latest update"):
+        for message in result.changes.messages():
+            st.write(message)
+
+# Colours come from the party registry, matched on any spelling of the sheet headers
+party_registry = party_index()
+thai_colors = party_registry.colors(list(party_cols) + [NO_INFO])
+
+# Lean mode: WebGL markers and party-only hover for slow connections
+lean = st.sidebar.checkbox("⚡ Lean rendering", value=False)
+# Figures are cached per data snapshot, so unchanged reruns skip plotly express entirely
+with span("parliament/figure_arc"):
+    fig = arc_figure(summary, province_df, thai_colors, lean=lean)
+
+with span("parliament/render_arc"):
+    st.plotly_chart(fig, width="stretch")
 
 st.divider()
 st.subheader("📊 Seat Distribution Summary")
@@ -159,6 +109,7 @@ for i in range(0, len(parties), cols_per_row):
             st.markdown(f"""
                 <div style="border-left: 5px solid {color}; padding: 10px; background-color: #f9f9f9; border-radius: 5px; margin-bottom: 10px;">
                     <h5 style="margin: 0; color: #333;">{party}</h4>
+                    <p style="margin: 0; font-size: 0.75em; color: #888;">{party_registry.english(party)}</p>
                     <p style="margin: 5px 0 2px 0; font-size: 1.3em; color: #666;">
                         Total: <b>{total_seats}</b> <span style="font-size: 0.7em;">({total_pct:.1f}%)</span>
                     </p>
@@ -168,10 +119,10 @@ for i in range(0, len(parties), cols_per_row):
                 </div>
             """, unsafe_allow_html=True)
 st.subheader("Total Parliament Control Share (500 Seats)")
-# Using 'Seats' as the numeric value ensures proportional slices
-fig_pie = px.pie(summary, values="Total", names=summary.index.tolist(), 
-                    color=summary.index.tolist(), color_discrete_map=thai_colors, hole=0.2)
-st.plotly_chart(fig_pie, width='stretch')
+with span("parliament/figure_pie"):
+    fig_pie = pie_figure(summary, thai_colors)
+with span("parliament/render_pie"):
+    st.plotly_chart(fig_pie, width='stretch')
 
 st.markdown("<br>", unsafe_allow_html=True) 
 
@@ -195,7 +146,7 @@ st.divider()
 st.subheader("🗳️ Constituency Voting Details")
 with st.expander("See detailed vote counts and seat allocations for each party"):
     
-    total_constituency_vote = province_df[party_cols].sum()
+    total_constituency_vote = election_model(province_df, partylist_df, party_cols).constituency_totals
     
     #### add constituency seats wins to total_constituency_vote
     total_constituency_vote = total_constituency_vote.to_frame(name="Total Votes")
@@ -219,7 +170,7 @@ with st.expander("How are Party List seats calculated?"):
     st.write(f"**National Quota:** {total_votes_sum:,} total votes / 100 seats = **{quota:,.2f} votes per seat**")
 
     # Format the calculation table for better readability
-    formatted_pl = pl_calc.sort_values("Total Votes", ascending=False).copy()
+    formatted_pl = pl_calc.sort_values("Total Votes", ascending=False)
     st.dataframe(
         formatted_pl.style.format({
             "Total Votes": "{:,.0f}",
@@ -227,4 +178,35 @@ with st.expander("How are Party List seats calculated?"):
             "Remainder": "{:.4f}"
         }).highlight_max(subset=["Extra Seat"], color="#e6f4ea"), 
         width="stretch"
-    )
\ No newline at end of file
+    )
+# --- NEW SECTION: MONTE CARLO SEAT PROJECTION ---
+st.divider()
+st.subheader("🎲 Seat Projection")
+with st.expander("Simulate the final result from the votes counted so far"):
+    st.caption(
+        "Each scenario adds a national swing per party plus district-level noise to the current vote shares "
+        "(districts with no results borrow their region's average), then re-runs the 400 constituency "
+        "and 100 party-list seat allocation."
+    )
+    n_scenarios = st.select_slider("Scenarios", options=[1000, 5000, 10000, 20000, 50000], value=10000)
+    if st.checkbox("Run projection", value=False):
+        with span("parliament/projection", scenarios=n_scenarios):
+            projection = project(province_df, partylist_df, party_cols, n_scenarios=n_scenarios)
+        projection_table = projection.summary(interval=0.9)
+        projection_table = projection_table[projection_table["High (90%)"] > 0]
+        st.dataframe(
+            projection_table.style.format({
+                "Mean Seats": "{:.1f}",
+                "Median": "{:.0f}",
+                "Low (90%)": "{:.0f}",
+                "High (90%)": "{:.0f}",
+                "Constituency (Mean)": "{:.1f}",
+                "Party List (Mean)": "{:.1f}",
+                "P(Majority)": "{:.1%}",
+                "P(Largest Party)": "{:.1%}",
+            }),
+            width="stretch"
+        )
+
+rerun_span.end()
+render_panel()
@@ -0,0 +1,377 @@
+"""Drive the Streamlit pages with many concurrent sessions and report rerun latency.
+
+    python -m benchmarks.loadtest                         # 2, 4 and 8 sessions
+    python -m benchmarks.loadtest --sessions 16 --actions 20 --output load.json
+    python -m benchmarks.loadtest --page district_map --max-p95 2000
+
+Every session is an ``AppTest`` running the real page script in this
+process, so sessions share the same caches, engines and background poller
+as viewers of one Streamlit server would. Sessions interact like viewers:
+toggling "Run Live Update", searching for districts (the AppTest stand-in
+for clicking a bubble), switching to lean rendering and clearing the
+selection.
+
+Live mode reads from a local stand-in of the Google Sheet that serves the
+workbook as CSV and adds votes to a few districts every
+``--churn-interval`` seconds, so the poller, snapshot history and
+incremental engine all see real updates.
+
+The report gives:
+- rerun latency percentiles per page and action
+- reruns per second at each concurrency level
+- resident memory per open session
+Unlike a real server, ``AppTest`` recompiles the page on every rerun.
+Compiles are serialised, because ``ast.parse`` is not safe to run from
+several threads at once on Python 3.11. This goes through a hook on
+Streamlit's private magic pass, and the run stops with an error if a
+Streamlit upgrade removes it. Treat the numbers as a slightly pessimistic
+upper bound.
+
+The exit status is 1 if any session raised, or if a page's p95 latency
+exceeds ``--max-p95`` milliseconds.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = {
+    "parliament": ROOT / "Parliament_Seats.py",
+    "district_map": ROOT / "pages" / "1_District_Map.py",
+}
+DEFAULT_SESSIONS = [2, 4, 8]
+
+
+class SheetStandIn:
+    """Local HTTP server serving ``/{gid}.csv`` like the Google Sheet export.
+
+    Vote columns of a few random rows grow every ``churn_interval`` seconds.
+    Responses carry an ETag, and ``If-None-Match`` gets a 304.
+    """
+
+    def __init__(self, churn_rows=5, churn_interval=2.0, seed=0):
+        self.churn_rows = churn_rows
+        self.churn_interval = churn_interval
+        self.rng = np.random.default_rng(seed)
+        self.frames = {}
+        self.headers = {}
+        self.party_cols = {}
+        self._lock = threading.Lock()
+        self._bodies = {}
+        self._last_churn = time.monotonic()
+        self.requests = 0
+        self.server = None
+
+    def load(self):
+        """Read the workbook sheets to serve; call after the environment is set up."""
+        from thai_election import snapshot
+        from thai_election.loader import NON_PARTY_COLS, SHEETS
+
+        with self._lock:
+            for sheet, (gid, header) in SHEETS.items():
+                df = snapshot.read_sheet(sheet).copy()
+                self.frames[gid] = df
+                self.headers[gid] = header
+                self.party_cols[gid] = [c for c in df.columns
+                                        if c not in NON_PARTY_COLS and "Unnamed" not in c and df[c].dtype.kind in "fi"]
+
+    def _body(self, gid):
+        with self._lock:
+            if self.churn_rows and time.monotonic() - self._last_churn >= self.churn_interval:
+                self._churn()
+            if gid not in self._bodies:
+                df = self.frames[gid]
+                # Sheets read with header=1 have a title row above the header
+                title = "Live results" + "," * (len(df.columns) - 1) + "\n" if self.headers[gid] else ""
+                self._bodies[gid] = (title + df.to_csv(index=False)).encode("utf-8")
+            return self._bodies[gid]
+
+    def _churn(self):
+        self._last_churn = time.monotonic()
+        for gid, cols in self.party_cols.items():
+            if not cols:
+                continue
+            df = self.frames[gid]
+            rows = self.rng.choice(len(df), size=min(self.churn_rows, len(df)), replace=False)
+            added = self.rng.integers(0, 500, size=(len(rows), len(cols)))
+            df.loc[df.index[rows], cols] = df.loc[df.index[rows], cols].fillna(0).to_numpy() + added
+            self._bodies.pop(gid, None)
+
+    def start(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                gid = self.path.lstrip("/").split(".csv")[0]
+                if gid not in stand_in.frames:
+                    self.send_error(404)
+                    return
+                stand_in.requests += 1
+                body = stand_in._body(gid)
+                etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/csv; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        # Port 0: the OS picks a free port, which goes into the returned URL template
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, name="sheet-stand-in", daemon=True).start()
+        return f"http://127.0.0.1:{self.server.server_port}/{{gid}}.csv"
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+
+
+def rss_bytes():
+    """Current resident set size of this process (Linux), else peak RSS."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+_compile_lock = threading.Lock()
+
+
+def _serialise_compiles():
+    """Route Streamlit's magic pass (the ``ast.parse`` step of each compile) through ``_compile_lock``.
+
+    This hooks a private Streamlit module, so check that the hook still
+    exists and is still what ``ScriptCache`` calls; otherwise stop rather
+    than run unsynchronised compiles that crash at random.
+    """
+    from streamlit.runtime.scriptrunner import magic, script_cache
+
+    add_magic = getattr(magic, "add_magic", None)
+    if not callable(add_magic) or getattr(script_cache, "magic", None) is not magic:
+        raise RuntimeError(
+            "streamlit.runtime.scriptrunner.magic.add_magic is gone or no longer used by "
+            "ScriptCache; the load test can't serialise page compiles with this Streamlit version"
+        )
+    if getattr(add_magic, "_serialised", False):
+        return
+
+    def locked(*args, **kwargs):
+        with _compile_lock:
+            return add_magic(*args, **kwargs)
+
+    locked._serialised = True
+    magic.add_magic = locked
+
+
+def _widget(elements, label):
+    for element in elements:
+        if element.label.startswith(label):
+            return element
+    return None
+
+
+class Session:
+    """One simulated viewer of ``page``; every interaction is a timed rerun."""
+
+    def __init__(self, page, seed, timeout):
+        from streamlit.testing.v1 import AppTest
+
+        self.page = page
+        self.rng = random.Random(seed)
+        self.app = AppTest.from_file(str(PAGES[page]), default_timeout=timeout)
+        self.samples = []  # (action, ms)
+        self.errors = []
+        self.district_ids = []
+
+    def _run(self, action, element=None):
+        started = time.perf_counter()
+        try:
+            (element or self.app).run()
+        except Exception as exc:  # a timed-out or crashed rerun counts as an error
+            self.errors.append(f"{action}: {exc!r}")
+            return
+        self.samples.append((action, (time.perf_counter() - started) * 1000))
+        self.errors.extend(f"{action}: {e.value}" for e in self.app.exception)
+
+    def open(self):
+        self._run("open")
+        search = _widget(self.app.selectbox, "🔎")
+        if search is not None:
+            self.district_ids = list(search.options)
+
+    def step(self):
+        """Pick and perform one interaction available on this page."""
+        actions = ["toggle_live", "lean", "rerun"]
+        if self.district_ids:
+            actions += ["search_district"] * 3 + ["clear_district"]
+        action = self.rng.choice(actions)
+        live = _widget(self.app.checkbox, "Run Live Update")
+        lean = _widget(self.app.sidebar.checkbox, "⚡ Lean rendering")
+        search = _widget(self.app.selectbox, "🔎")
+
+        # A failed rerun leaves no widgets behind; fall back to a plain rerun
+        if action == "toggle_live" and live is not None:
+            self._run(action, live.set_value(not live.value))
+        elif action == "lean" and lean is not None:
+            self._run(action, lean.set_value(not lean.value))
+        elif action == "search_district" and search is not None:
+            self._run(action, search.set_value(self.rng.choice(self.district_ids)))
+        elif action == "clear_district" and search is not None:
+            self._run(action, search.set_value(None))
+        else:
+            self._run("rerun")
+
+
+def _percentiles(ms):
+    if not ms:
+        return {}
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {"count": len(ms), "mean_ms": statistics.fmean(ms), "p50_ms": p50,
+            "p95_ms": p95, "p99_ms": p99, "max_ms": max(ms)}
+
+
+def warm_up(pages, timeout):
+    """Open each page once so imports and process-wide caches don't count against sessions."""
+    for page in pages:
+        session = Session(page, 0, timeout)
+        session.open()
+        if session.errors:
+            raise SystemExit(f"{page} fails before any load: {session.errors[0]}")
+
+
+def run_level(n_sessions, pages, actions, think_time, timeout, seed):
+    """Open ``n_sessions`` sessions (round-robin over ``pages``) and drive them concurrently."""
+    import gc
+
+    gc.collect()
+    rss_before = rss_bytes()
+    sessions = [Session(pages[i % len(pages)], seed + i, timeout) for i in range(n_sessions)]
+
+    def drive(session):
+        session.open()
+        for _ in range(actions):
+            if think_time:
+                time.sleep(session.rng.uniform(0, 2 * think_time))
+            session.step()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_sessions, thread_name_prefix="session") as pool:
+        list(pool.map(drive, sessions))
+    elapsed = time.perf_counter() - started
+    # Sessions (and their element trees) are still alive here
+    rss_after = rss_bytes()
+
+    samples = [(s.page, action, ms) for s in sessions for action, ms in s.samples]
+    result = {
+        "sessions": n_sessions,
+        "elapsed_s": elapsed,
+        "reruns": len(samples),
+        "throughput_rps": len(samples) / elapsed if elapsed else 0.0,
+        "rss_delta_mb": (rss_after - rss_before) / 2**20,
+        "rss_per_session_mb": (rss_after - rss_before) / 2**20 / n_sessions,
+        "errors": [f"{s.page}: {e}" for s in sessions for e in s.errors],
+        "pages": {},
+    }
+    for page in pages:
+        page_ms = [ms for p, _, ms in samples if p == page]
+        result["pages"][page] = {"all": _percentiles(page_ms)}
+        for action in sorted({a for p, a, _ in samples if p == page}):
+            result["pages"][page][action] = _percentiles([ms for p, a, ms in samples if p == page and a == action])
+    return result
+
+
+def print_report(results):
+    for level in results:
+        print(f"\n== {level['sessions']} concurrent session(s): {level['reruns']} reruns in "
+              f"{level['elapsed_s']:.1f}s = {level['throughput_rps']:.1f} reruns/s, "
+              f"~{level['rss_per_session_mb']:.1f} MB RSS per session")
+        print(f"{'page':<14} {'action':<16} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for page, actions in level["pages"].items():
+            for action, s in actions.items():
+                if s:
+                    print(f"{page:<14} {action:<16} {s['count']:>5} {s['p50_ms']:>9.1f} "
+                          f"{s['p95_ms']:>9.1f} {s['p99_ms']:>9.1f} {s['max_ms']:>9.1f}")
+        for error in level["errors"][:10]:
+            print(f"  ERROR {error}")
+
+
+def check(results, max_p95):
+    failures = []
+    for level in results:
+        if level["errors"]:
+            failures.append(f"{level['sessions']} sessions: {len(level['errors'])} error(s)")
+        for page, actions in level["pages"].items():
+            p95 = actions["all"].get("p95_ms")
+            if max_p95 is not None and p95 is not None and p95 > max_p95:
+                failures.append(f"{level['sessions']} sessions: {page} p95 {p95:.0f} ms > {max_p95:.0f} ms")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, action="append", help="concurrent sessions (repeatable)")
+    parser.add_argument("--page", action="append", choices=list(PAGES), help="page to drive (repeatable)")
+    parser.add_argument("--actions", type=int, default=10, help="interactions per session after opening")
+    parser.add_argument("--think-time", type=float, default=0.0, help="mean seconds between interactions")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds before a rerun counts as failed")
+    parser.add_argument("--churn-rows", type=int, default=5, help="districts updated per stand-in tick (0: static)")
+    parser.add_argument("--churn-interval", type=float, default=2.0, help="seconds between stand-in updates")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="seconds between live sheet polls")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=Path("loadtest_results.json"))
+    parser.add_argument("--max-p95", type=float, help="fail if any page's p95 rerun latency exceeds this (ms)")
+    args = parser.parse_args(argv)
+
+    # The package reads these at import time, so set them before anything imports it
+    workdir = tempfile.mkdtemp(prefix="thai-election-load-")
+    os.environ["THAI_ELECTION_STORE"] = str(Path(workdir) / "snapshots")
+    os.environ["THAI_ELECTION_POLL_INTERVAL"] = str(args.poll_interval)
+    os.environ["THAI_ELECTION_LIVE_TTL"] = str(args.poll_interval)
+    sys.path.insert(0, str(ROOT))
+    stand_in = SheetStandIn(args.churn_rows, args.churn_interval, args.seed)
+    os.environ["THAI_ELECTION_SHEET_URL"] = stand_in.start()
+    stand_in.load()
+
+    pages = args.page or list(PAGES)
+    _serialise_compiles()
+    warm_up(pages, args.timeout)
+    results = []
+    try:
+        for n in args.sessions or DEFAULT_SESSIONS:
+            results.append(run_level(n, pages, args.actions, args.think_time, args.timeout, args.seed))
+    finally:
+        stand_in.stop()
+
+    print_report(results)
+    print(f"\nstand-in served {stand_in.requests} sheet requests")
+    args.output.write_text(json.dumps({"pages": pages, "actions": args.actions, "results": results}, indent=2))
+    print(f"Results written to {args.output}")
+    failures = check(results, args.max_p95)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""Time each hot path of the dashboard on synthetic data of increasing size.
+
+    python -m benchmarks.run                       # default sizes, check thresholds
+    python -m benchmarks.run --size 400x12 --size 10000x100 --output bench.json
+    python -m benchmarks.run --baseline bench_prev.json --tolerance 1.5
+
+Sizes are ``<constituencies>x<parties>``. Results are written as JSON; the
+exit status is 1 if any stage exceeds its limit in ``thresholds.json`` or is
+slower than ``--tolerance`` times the ``--baseline`` run.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import generate, write_workbook
+from thai_election import layout, snapshot
+from thai_election.loader import process_sheet
+from thai_election.parliament import create_parliament_data
+from thai_election.results import party_list_table, seat_summary
+
+DEFAULT_SIZES = ["400x12", "2000x30", "10000x100"]
+THRESHOLDS = Path(__file__).with_name("thresholds.json")
+
+
+def parse_size(text):
+    constituencies, parties = text.lower().split("x")
+    return int(constituencies), int(parties)
+
+
+def timed(fn, repeat):
+    """Run ``fn`` ``repeat`` times; return (last result, list of ms)."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return result, times
+
+
+def warm_up():
+    """Pay plotly's one-off import and template cost outside the timed stages."""
+    import plotly.express as px
+
+    px.scatter(pd.DataFrame({"x": [0], "y": [0]}), x="x", y="y").to_json()
+
+
+def bench_size(n_constituencies, n_parties, repeat, workdir):
+    """Return ``{stage: [ms, ...]}`` for one data size."""
+    import plotly.express as px
+
+    raw_province, raw_partylist, coordinates = generate(n_constituencies, n_parties)
+    workbook = write_workbook(Path(workdir) / f"bench_{n_constituencies}x{n_parties}.xlsx",
+                              raw_province, raw_partylist, coordinates)
+    cache_dir = Path(workdir) / "cache"
+    snapshot.build(workbook, cache_dir)
+    timings = {}
+
+    _, timings["load_xlsx"] = timed(
+        lambda: pd.read_excel(workbook, header=1, sheet_name="Province"), max(1, repeat // 3))
+    _, timings["load_snapshot"] = timed(
+        lambda: snapshot.read_sheet("Province", workbook, cache_dir), repeat)
+
+    (province_df, _), timings["winners"] = timed(lambda: process_sheet(raw_province.copy()), repeat)
+    partylist_df, party_cols = process_sheet(raw_partylist.copy())
+
+    list_seats = max(100, n_constituencies // 4)
+
+    def allocation():
+        pl_calc = party_list_table(partylist_df[party_cols].sum(), seats=list_seats)
+        return seat_summary(province_df['District_Winner'].value_counts(), pl_calc)
+
+    summary, timings["seat_allocation"] = timed(allocation, repeat)
+    n_seats = n_constituencies + list_seats
+    coords, timings["parliament_layout"] = timed(
+        lambda: create_parliament_data(summary, province_df, n_seats=n_seats), repeat)
+
+    plot_df = province_df.merge(coordinates[['Province (English)', 'Latitude', 'Longitude']],
+                                on='Province (English)', how='left')
+    offsets, timings["map_layout"] = timed(lambda: layout._compute_offsets(plot_df, 0.13, "grid"), repeat)
+    plot_df = plot_df.assign(Lat_Jitter=plot_df['Latitude'] + offsets['dy'],
+                             Lon_Jitter=plot_df['Longitude'] + offsets['dx'])
+
+    def figures():
+        fig = px.scatter(coords, x="x", y="y", color="Party", custom_data=["Party", "Location"])
+        fig_map = px.scatter_mapbox(plot_df, lat="Lat_Jitter", lon="Lon_Jitter", color="District_Winner",
+                                    hover_name="Constituency_ID", mapbox_style="carto-positron")
+        return fig, fig_map
+
+    figs, timings["figure_build"] = timed(figures, max(1, repeat // 3))
+    _, timings["figure_json"] = timed(lambda: [f.to_json() for f in figs], max(1, repeat // 3))
+    return timings
+
+
+def check(results, thresholds, baseline, tolerance):
+    """Annotate ``results`` in place with limits; return the failing entries."""
+    previous = {(r["size"], r["stage"]): r["median_ms"] for r in (baseline or {}).get("results", [])}
+    failures = []
+    for r in results:
+        limit = thresholds.get(r["size"], {}).get(r["stage"])
+        r["threshold_ms"] = limit
+        r["baseline_ms"] = previous.get((r["size"], r["stage"]))
+        over_limit = limit is not None and r["median_ms"] > limit
+        regressed = r["baseline_ms"] is not None and r["median_ms"] > r["baseline_ms"] * tolerance
+        r["ok"] = not (over_limit or regressed)
+        if not r["ok"]:
+            failures.append(r)
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", action="append", help="<constituencies>x<parties> (repeatable)")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--output", type=Path, default=Path("bench_results.json"))
+    parser.add_argument("--thresholds", type=Path, default=THRESHOLDS)
+    parser.add_argument("--baseline", type=Path, help="previous --output file to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown vs --baseline")
+    args = parser.parse_args(argv)
+
+    thresholds = json.loads(args.thresholds.read_text()) if args.thresholds.exists() else {}
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+
+    warm_up()
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.size or DEFAULT_SIZES:
+            n_constituencies, n_parties = parse_size(size)
+            for stage, times in bench_size(n_constituencies, n_parties, args.repeat, workdir).items():
+                results.append({
+                    "size": size,
+                    "constituencies": n_constituencies,
+                    "parties": n_parties,
+                    "stage": stage,
+                    "median_ms": round(statistics.median(times), 3),
+                    "min_ms": round(min(times), 3),
+                    "runs": len(times),
+                })
+                print(f"{size:>10} {stage:<18} {results[-1]['median_ms']:>10.2f} ms")
+
+    failures = check(results, thresholds, baseline, args.tolerance)
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    for r in failures:
+        print(f"REGRESSION {r['size']} {r['stage']}: {r['median_ms']:.1f} ms "
+              f"(limit {r['threshold_ms']}, baseline {r['baseline_ms']})", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
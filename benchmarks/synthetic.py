@@ -0,0 +1,74 @@
+"""Synthetic election data with the same schema as ``Th election Province list.xlsx``."""
+import numpy as np
+import pandas as pd
+
+REGIONS = ["Bangkok", "Central", "North", "Northeast", "East", "West", "South"]
+# Rough bounding box of Thailand for fake province centroids
+LAT_RANGE = (6.0, 20.0)
+LON_RANGE = (98.0, 105.5)
+
+
+def party_names(n_parties):
+    return [f"พรรค{i:03d}" for i in range(n_parties - 1)] + ["Others"]
+
+
+def generate(n_constituencies=400, n_parties=12, n_provinces=None, reported=1.0, seed=0):
+    """Return ``(province_df, partylist_df, coordinates_df)`` as raw sheets.
+
+    Vote columns follow a skewed Dirichlet so a few large parties dominate, as
+    in the real data. ``reported`` is the share of constituencies with votes;
+    the rest are all zeros ("NO INFORMATION YET").
+    """
+    rng = np.random.default_rng(seed)
+    n_provinces = n_provinces or max(1, round(n_constituencies * 77 / 400))
+    provinces = [f"Province {i:03d}" for i in range(n_provinces)]
+
+    # Every province gets at least one district; the rest are spread by weight.
+    weights = rng.pareto(1.5, n_provinces) + 1
+    extra = rng.multinomial(n_constituencies - n_provinces, weights / weights.sum())
+    counts = extra + 1
+    province = np.repeat(provinces, counts)
+    district = np.concatenate([np.arange(1, c + 1) for c in counts])
+    region = np.asarray(REGIONS)[rng.integers(0, len(REGIONS), n_provinces)]
+
+    parties = party_names(n_parties)
+    strength = np.sort(rng.pareto(1.2, n_parties) + 0.05)[::-1]
+
+    def votes():
+        turnout = rng.integers(40_000, 120_000, n_constituencies)[:, None]
+        shares = rng.dirichlet(strength * 5, n_constituencies)
+        v = shares * turnout
+        v[rng.random(n_constituencies) >= reported] = 0
+        return v
+
+    meta = pd.DataFrame({
+        "Province (English)": province,
+        "District": district,
+        "Province": [f"จังหวัด{p[-3:]}" for p in province],
+        "Constituency_ID": [f"{p}_{d:02d}" for p, d in zip(province, district)],
+        "Region": np.repeat(region, counts),
+    })
+    province_df = pd.concat([meta, pd.DataFrame(votes(), columns=parties)], axis=1)
+    partylist_df = pd.concat([meta, pd.DataFrame(votes(), columns=parties)], axis=1)
+
+    lat = rng.uniform(*LAT_RANGE, n_provinces)
+    lon = rng.uniform(*LON_RANGE, n_provinces)
+    coordinates_df = pd.DataFrame({
+        "Province (English)": provinces,
+        "Coordinates": [f"{a}, {b}" for a, b in zip(lat, lon)],
+        "Latitude": lat,
+        "Longitude": lon,
+    })
+    return province_df, partylist_df, coordinates_df
+
+
+def write_workbook(path, province_df, partylist_df, coordinates_df):
+    """Write the frames as an xlsx laid out like the real workbook (title row above headers)."""
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for sheet, df, startrow in (
+            ("Province", province_df, 1),
+            ("Party List", partylist_df, 1),
+            ("Coordinates", coordinates_df, 0),
+        ):
+            df.to_excel(writer, sheet_name=sheet, index=False, startrow=startrow)
+    return path
@@ -1,107 +1,54 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import numpy as np # For generating district positions
 import plotly.graph_objects as go
 
+from thai_election.drilldown import constituency_index
+from thai_election.figures import district_map_figure, seats_bar_figure, votes_bar_figure
+from thai_election.incremental import shared_engine
+from thai_election.ingest import ensure_background_poller
+from thai_election.layout import LAYOUTS
+from thai_election.loader import NO_INFO, load_election_data, load_sheet
+from thai_election.model import election_model
+from thai_election.parties import party_index
+from thai_election.profiling import render_panel, span
+
 st.set_page_config(page_title="400 Constituency Seats Map", layout="wide")
+rerun_span = span("district_map/rerun")
 
 st.title("🇹🇭 400 Constituency Seat Winners")
 st.subheader("Each bubble represents one district, colored by winning party.")
 
 run_live = st.checkbox("Run Live Update", value=False)
-# 1. Load Data
-def load_election_data():
-    sheet_id = "1fm_6pbiXU6jBwHtu13Yuqh_XgQY-AW03"
-    province_gid = "858321697"
-    partylist_gid = "374730466"
-    coordinates_gid = "2069825376"
-
-    def process_sheet(gid, header=1):
-        df = pd.DataFrame()
-        if run_live:
-            url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv&gid={gid}"
-            df = pd.read_csv(url, header=header)
-        else:
-            df = pd.read_excel(f"Th election Province list.xlsx", header=header, sheet_name=gid)
-        non_party_cols = ['Province', 'Region', 'Constituency_ID', 'Province (English)', 'District', "Coordinates"]
-        party_cols = [c for c in df.columns if c not in non_party_cols and "Unnamed" not in c]
-        for col in party_cols:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-        row_max = df[party_cols].max(axis=1)
-        row_idxmax = df[party_cols].idxmax(axis=1)
-
-        # Only assign a winner if the max vote is > 0; otherwise, leave blank
-        df['District_Winner'] = row_idxmax.where(row_max > 0, "NO INFORMATION YET")
-        df['Winning_Votes'] = row_max
-        return df, party_cols
-
-    province_df, _ = process_sheet(province_gid if run_live else "Province")
-    partylist_df, party_cols = process_sheet(partylist_gid if run_live else "Party List")
-    province_coordinates_df, _ = process_sheet(coordinates_gid if run_live else "Coordinates", header=0)
-    return province_df, partylist_df, party_cols, province_coordinates_df
-
-province_df, partylist_df, party_cols, province_coordinates_df = load_election_data()
+if run_live:
+    # One poller per process keeps the local snapshot store fresh for every session
+    ensure_background_poller()
+# 1. Load Data (cached per process and shared by every session)
+with span("district_map/load"):
+    province_df, partylist_df, party_cols = load_election_data(live=run_live)
+    province_coordinates_df, _ = load_sheet("Coordinates", live=run_live)
+    # Keeps the Region x Province rollup current, touching only changed districts
+    rollup = shared_engine("live" if run_live else "xlsx").update(province_df, partylist_df, party_cols).cube
 
 # 2. Prepare Plotting Data
-plot_df = province_df.merge(
-    province_coordinates_df[['Province (English)', 'Latitude', 'Longitude']], 
-    on='Province (English)', 
-    how='left'
-)
+layout_span = span("district_map/map_layout")
+# One model per snapshot, shared by every session (no per-session merge or copies)
+model = election_model(province_df, partylist_df, party_cols)
 zoom_level = 7
-# Organised layout: arrange districts in a small grid around the province centroid
+# Organised layout: arrange districts in a small cluster around the province centroid
 # This creates deterministic, non-overlapping clusters per province instead of random jitter.
 spacing = 0.13 # degrees between points in the province grid
 marker_size = 18
-# Prepare offset dataframe
-offsets = pd.DataFrame(0.0, index=plot_df.index, columns=['dx', 'dy'])
-
-for province, group in plot_df.groupby('Province (English)'):
-    n = len(group)
-    if n == 1:
-        # single district: keep at centroid
-        continue
-    grid_size = int(np.ceil(np.sqrt(n)))
-
-    # Scale longitude offsets by 1/cos(lat) to approximate equal physical spacing
-    centroid_lat = group['Latitude'].mean()
-    lat_rad = np.deg2rad(centroid_lat)
-    lon_scale = 1.0 / max(np.cos(lat_rad), 0.2)
-
-    # Create grid coordinates: left-to-right, top-to-bottom
-    coords_list = []
-    for row in reversed(range(grid_size)):
-        y = (row - (grid_size - 1) / 2.0) * spacing
-        for col in range(grid_size):
-            x = (col - (grid_size - 1) / 2.0) * spacing * lon_scale
-            coords_list.append([x, y])
-    coords = np.array(coords_list)[:n]
-
-    # # Deterministic ordering: use Constituency_ID if present, otherwise sort by District name
-    # if 'Constituency_ID' in group.columns:
-    #     order_idx = np.argsort(group['Constituency_ID'].astype(str).values)
-    # else:
-    order_idx = np.argsort(group['District'].astype(int).values)
-
-    ordered_indices = group.index.to_numpy()[order_idx]
-    # Assign coordinates in left-to-right, top-to-bottom order to the sorted districts
-    offsets.loc[ordered_indices, 'dx'] = coords[:, 0]
-    offsets.loc[ordered_indices, 'dy'] = coords[:, 1]
-
-# Apply offsets: dx -> longitude, dy -> latitude
-plot_df['Lat_Jitter'] = plot_df['Latitude'] + offsets['dy']
-plot_df['Lon_Jitter'] = plot_df['Longitude'] + offsets['dx']
+# Lean mode: no per-bubble labels and ID-only hover for slow connections
+lean = st.sidebar.checkbox("⚡ Lean rendering", value=False)
+cluster_layout = st.sidebar.selectbox("District layout", LAYOUTS, index=0)
+# Province centroid plus the layout offset (dx -> longitude, dy -> latitude)
+plot_df = model.map_frame(province_coordinates_df, spacing=spacing, method=cluster_layout)
+layout_span.end()
 
 # 3. Define Party Colors
-thai_colors = {
-    "เพื่อไทย": "#DF0000", "ประชาชน": "#FF6600",
-    "ภูมิใจไทย": "#00008B", "ประชาธิปัตย์": "#00BFFF",
-    "รวมไทยสร้างชาติ": "#000073", "พลังประชารัฐ": "#0000FF",
-    "ชาติไทยพัฒนา": "#FF69B4", "ประชาชาติ": "#8B4513",
-    "NO INFORMATION YET": "#D3D3D3",
-    "พรรคเศรษฐกิจ":"#FFD700","พรรคกล้าธรรม":"#00A651"
-}
+# Colours come from the party registry, matched on any spelling of the sheet headers
+party_registry = party_index()
+thai_colors = party_registry.colors(list(party_cols) + [NO_INFO])
 
 # 4. Sidebar: Zoom Control
 
@@ -112,31 +59,10 @@ text_size = 7 + (zoom_level - 3) * 1  # ranges from 7 to 14
 
 # 4. Layout: Two Columns
 col_map, col_info = st.columns([2, 1])
-plot_df['District'] =plot_df['District'].astype(str)
 with col_map:
     
-    fig_map = px.scatter_mapbox(
-        plot_df,
-        lat="Lat_Jitter",
-        lon="Lon_Jitter",
-        text="District",
-        color="District_Winner",
-        color_discrete_map=thai_colors,
-        hover_name="Constituency_ID",
-        hover_data={
-            # "Province (English)": True,
-            "District": False,
-            "District_Winner": True,
-            "Winning_Votes": True,
-            "Lat_Jitter": False,
-            "Lon_Jitter": False
-        },
-        zoom=zoom_level,
-        center={"lat": 13.7367, "lon": 100.5231},
-        mapbox_style="carto-positron",
-        height=1000
-        )
-    fig_map.update_traces(marker=dict(size=marker_size, opacity=0.8), textfont=dict(size=text_size, color='white'), hoverinfo=None)
+    with span("district_map/figure_map"):
+        fig_map = district_map_figure(plot_df, thai_colors, zoom_level, marker_size, text_size, lean=lean)
 
     # Add a separate text-only trace so labels are displayed centered without altering markers
     # fig_map.add_trace(
@@ -154,54 +80,61 @@ with col_map:
 
     # ENABLE INTERACTION
     # Selection mode 'points' allows us to capture which bubble is clicked
-    selected_data = st.plotly_chart(
-        fig_map,
-        on_select="rerun",
-        selection_mode="points",
-        use_container_width=True,
-        config={"displayModeBar": False, "scrollZoom": True}
-    )
+    with span("district_map/render_map"):
+        selected_data = st.plotly_chart(
+            fig_map,
+            on_select="rerun",
+            selection_mode="points",
+            use_container_width=True,
+            config={"displayModeBar": False, "scrollZoom": True}
+        )
 
 with col_info:
     # 5. Logic to show District Details
     district_name = None
+    # Built once per data snapshot: Constituency_ID -> precomputed top-5 parties and margin
+    district_index = constituency_index(province_df, party_cols)
+    searched = st.selectbox("🔎 Find a district", district_index.ids, index=None,
+                            placeholder="Type a province or Constituency_ID")
     
     # Check if a point was clicked
     if selected_data and "selection" in selected_data and selected_data["selection"]["points"]:
         # Get district name from the hovertext/hover_name of the clicked point
         district_name = selected_data["selection"]["points"][0]["hovertext"]
+    elif searched:
+        district_name = searched
     
-    if district_name:
+    if district_name in district_index:
         st.subheader(f"Results: {district_name}")
         
-        # Filter data for selected district
-        district_row = province_df[province_df['Constituency_ID'] == str(district_name)].iloc[0]
-        
-        # Get Top 3 Parties
-        votes = district_row[party_cols].sort_values(ascending=False).head(5)
-        votes_df = pd.DataFrame({'Party': votes.index, 'Votes': votes.values})
+        with span("district_map/drilldown"):
+            district_result = district_index.get(district_name)
+            votes_df = district_result.votes_frame()
+        if district_result.winner:
+            st.caption(f"Winning margin: {district_result.margin:,.0f} votes "
+                       f"of {district_result.total_votes:,.0f} counted")
+        province_rollup = rollup.province(district_result.province)
+        if province_rollup is not None:
+            province_seats = province_rollup[1]
+            undeclared = province_seats.pop(NO_INFO)
+            province_seats = province_seats[province_seats > 0].sort_values(ascending=False)
+            seat_text = [f"{party} {count}" for party, count in province_seats.items()]
+            if undeclared:
+                seat_text.append(f"{undeclared} undeclared")
+            st.caption(f"{district_result.province} ({district_result.region}) seats: " + ", ".join(seat_text))
         
         # Bar Chart
-        fig_bar = px.bar(
-            votes_df,
-            x='Votes',
-            y='Party',
-            orientation='h',
-            color='Party',
-            color_discrete_map=thai_colors,
-            text_auto=',.0f'
-        )
-        fig_bar.update_layout(showlegend=False, xaxis_title="Total Votes", yaxis_title="")
+        fig_bar = votes_bar_figure(votes_df, thai_colors)
         st.plotly_chart(fig_bar, use_container_width=True,)
         
         # Show breakdown table
         st.dataframe(votes_df, hide_index=True, use_container_width=True)
     else:
-        st.info("Click on a district bubble on the map to see the Top 3 party breakdown.")
+        st.info("Click on a district bubble on the map, or search for one above, to see the Top 3 party breakdown.")
         # Optional: Show national top 3 if nothing is selected
         st.caption("Current View: National Summary")
         # Sum all columns (parties), sort, and take the top 5
-        total_votes_series = province_df[party_cols].sum().sort_values(ascending=False).head(5)
+        total_votes_series = model.constituency_totals.sort_values(ascending=False).head(5)
 
         # Convert to a DataFrame for Plotly
         total_votes_df = pd.DataFrame({
@@ -209,51 +142,23 @@ with col_info:
             'Votes': total_votes_series.values
         })
 
-        # 2. Create Horizontal Bar Chart
-        fig_total = px.bar(
-            total_votes_df,
-            x='Votes',
-            y='Party',
-            orientation='h',
-            color='Party',
-            color_discrete_map=thai_colors,  # Uses your global color map
-            text_auto=',.0f',                # Adds formatted vote counts on the bars
-            title="National Top 5 Constituency Votes"
-        )
-
-        # 3. Refine Layout
-        fig_total.update_layout(
-            showlegend=False,
-            yaxis={'categoryorder': 'total ascending'}, # Puts the highest vote at the top
-            xaxis_title="Total Votes",
-            yaxis_title="",
+        # 2. Create Horizontal Bar Chart (highest vote at the top)
+        fig_total = votes_bar_figure(
+            total_votes_df, thai_colors, title="National Top 5 Constituency Votes",
+            yaxis={'categoryorder': 'total ascending'},
             margin=dict(l=20, r=20, t=40, b=20),
             height=400
         )
 
         st.plotly_chart(fig_total, use_container_width=True)
 
-        constituency_winners = province_df['District_Winner'].value_counts()
-        # st.write(constituency_winners)
-
-        fig_bar = px.bar(
-            constituency_winners, 
-            x="count", 
-            y=constituency_winners.index,
-            orientation='h',
-            color=constituency_winners.index,
-            color_discrete_map=thai_colors,
-            text_auto=True, # Automatically adds the count number on the bar
-            labels={'count': 'Number of Seats', 'index': 'Party'},
-            title="Constituency Seats Won by Party"
-        )
+        constituency_winners = model.seat_counts
+        fig_bar = seats_bar_figure(constituency_winners, thai_colors)
+        st.plotly_chart(fig_bar, width='stretch')
 
-        # Sorting: This ensures the largest party is at the top
-        fig_bar.update_layout(
-            yaxis={'categoryorder': 'total ascending'},
-            yaxis_title="",
-            showlegend=False, # Party names are already on the Y-axis
-            margin=dict(l=20, r=20, t=30, b=20)
-        )
+        st.caption("Constituency seats by region")
+        seats_by_region = rollup.seats_by("region")
+        st.dataframe(seats_by_region.loc[:, seats_by_region.sum() > 0], width="stretch")
 
-        st.plotly_chart(fig_bar, width='stretch')
\ No newline at end of file
+rerun_span.end()
+render_panel()
@@ -0,0 +1,95 @@
+import streamlit as st
+import numpy as np
+import plotly.graph_objects as go
+
+from thai_election.ingest import ensure_background_poller
+from thai_election.loader import NO_INFO, load_election_data
+from thai_election.model import election_model
+from thai_election.parties import party_index
+from thai_election.profiling import render_panel, span
+from thai_election.whatif import swing_base
+
+st.set_page_config(page_title="What If? Swing Simulator", layout="wide")
+rerun_span = span("what_if/rerun")
+
+st.title("🔀 What If? Swing Simulator")
+st.caption("Move a share of every district's vote from one party to another and see the 500 seats re-allocate instantly.")
+
+run_live = st.checkbox("Run Live Update", value=False)
+if run_live:
+    # One poller per process keeps the local snapshot store fresh for every session
+    ensure_background_poller()
+# 1. Load Data (cached per process and shared by every session)
+with span("what_if/load"):
+    province_df, partylist_df, party_cols = load_election_data(live=run_live)
+    base = swing_base(election_model(province_df, partylist_df, party_cols))
+
+# 2. Scenario Controls
+ranked = [base.parties[i] for i in base.base.order()]
+col_from, col_to, col_swing = st.columns([1, 1, 2])
+with col_from:
+    source = st.selectbox("Votes move from", ranked, index=0)
+with col_to:
+    target = st.selectbox("Votes move to", ranked, index=min(1, len(ranked) - 1))
+with col_swing:
+    national = st.slider("National swing (percentage points of each district's vote)", -20.0, 20.0, 0.0, 0.5)
+
+by_region = {}
+with st.expander("Regional swing (added on top of the national swing)"):
+    region_cols = st.columns(3)
+    for i, region in enumerate(base.regions):
+        with region_cols[i % 3]:
+            by_region[region] = st.slider(region, -20.0, 20.0, 0.0, 0.5, key=f"swing_{region}")
+
+# 3. Recompute (NumPy only, a fraction of a millisecond)
+with span("what_if/recompute"):
+    result = base.simulate(source, target, national=national, by_region=by_region)
+
+# Colours come from the party registry, matched on any spelling of the sheet headers
+party_registry = party_index()
+thai_colors = party_registry.colors(list(party_cols) + [NO_INFO])
+
+# 4. Display
+metric_cols = st.columns(3)
+for col, party in zip(metric_cols, [source, target]):
+    i = base.party_index(party)
+    col.metric(party, int(result.total_seats[i]),
+               delta=int(result.total_seats[i] - base.base.total_seats[i]))
+metric_cols[2].metric("Districts changing hands", int(result.flipped.sum()))
+
+# A single WebGL trace with per-seat colours keeps the figure cheap to rebuild on every slider move
+with span("what_if/figure_arc"):
+    x, y, labels = result.seat_parties()
+    colors = np.array([thai_colors.get(label, "#808080") for label in labels], dtype=object)
+    fig = go.Figure(go.Scattergl(
+        x=x, y=y, mode="markers", text=labels,
+        marker=dict(size=14, color=colors, line=dict(width=1, color='white')),
+        hovertemplate="<b>%{text}</b><extra></extra>",
+    ))
+    fig.update_layout(
+        xaxis=dict(visible=False), yaxis=dict(visible=False),
+        plot_bgcolor="rgba(0,0,0,0)", height=600, showlegend=False,
+        margin=dict(l=20, r=20, t=20, b=20)
+    )
+with span("what_if/render_arc"):
+    st.plotly_chart(fig, width="stretch")
+
+st.subheader("📊 Seats under this scenario")
+summary = result.summary()
+baseline = base.base.summary()["Total"]
+summary["Change"] = summary["Total"] - baseline.reindex(summary.index).fillna(0).astype(int)
+st.dataframe(summary, width="stretch")
+
+if result.flipped.any():
+    with st.expander(f"🔄 {int(result.flipped.sum())} district(s) change hands"):
+        # Winner index -1 (no votes yet) picks the trailing NO_INFO label
+        names = np.append(np.asarray(base.parties, dtype=object), NO_INFO)
+        flipped = np.flatnonzero(result.flipped)
+        st.dataframe({
+            "Constituency_ID": base.constituency_ids[flipped],
+            "Current Winner": names[base.base_winner[flipped]],
+            "Scenario Winner": names[result.winner[flipped]],
+        }, hide_index=True, width="stretch")
+
+rerun_span.end()
+render_panel()
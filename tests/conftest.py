@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate
+from thai_election.loader import party_columns, process_sheet
+
+
+def _election(districts=400, parties=12, reported=0.9, seed=1, close_race=False, region=True):
+    """Processed ``(province_df, partylist_df, party_cols)`` of a synthetic result.
+
+    ``close_race`` makes the first district 1000.4 vs 1000.45 between the
+    first two parties, in both sheets.
+    """
+    province, partylist, _ = generate(districts, parties, reported=reported, seed=seed)
+    party_cols = party_columns(province.columns)
+    if close_race:
+        for df in (province, partylist):
+            df.loc[0, party_cols] = 0.0
+            df.loc[0, party_cols[:2]] = [1000.4, 1000.45]
+    if not region:
+        province, partylist = province.drop(columns="Region"), partylist.drop(columns="Region")
+    province, party_cols = process_sheet(province)
+    partylist, _ = process_sheet(partylist)
+    return province, partylist, party_cols
+
+
+def _snapshot_series(rounds=30, seed=1, raw=False):
+    """Successive snapshots with changed, removed and re-added constituencies.
+
+    Yields processed ``(province_df, partylist_df, party_cols)``, or the raw
+    sheets as fetched (``(province, partylist)``) with ``raw=True``.
+    """
+    rng = np.random.default_rng(seed)
+    raw_province, raw_list, _ = generate(400, 12, reported=0.9, seed=seed)
+    party_cols = party_columns(raw_province.columns)
+    province, party_list = raw_province, raw_list
+    for step in range(rounds):
+        province, party_list = province.copy(), party_list.copy()
+        rows = rng.choice(len(province), 20, replace=False)
+        province.loc[province.index[rows], party_cols] = rng.random((20, len(party_cols))) * 30000
+        rows = rng.choice(len(party_list), 10, replace=False)
+        party_list.loc[party_list.index[rows], party_cols] += rng.random((10, len(party_cols))) * 1000
+        if step % 7 == 3:
+            province = province.drop(index=province.index[rng.choice(len(province), 3, replace=False)])
+        if step % 7 == 5:
+            missing = ~raw_province['Constituency_ID'].isin(province['Constituency_ID'])
+            province = pd.concat([province, raw_province[missing]])
+        if raw:
+            yield province, party_list
+            continue
+        province_df, cols = process_sheet(province)
+        partylist_df, _ = process_sheet(party_list)
+        yield province_df, partylist_df, cols
+
+
+@pytest.fixture
+def make_election():
+    """Factory for synthetic election frames; see ``_election`` for the options."""
+    return _election
+
+
+@pytest.fixture
+def election():
+    return _election()
+
+
+@pytest.fixture
+def snapshot_series():
+    """Factory for a series of snapshots; see ``_snapshot_series``."""
+    return _snapshot_series
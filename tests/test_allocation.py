@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from thai_election.allocation import allocate
+
+
+def _old_hare(votes, seats):
+    """The original page's allocation: int() of the Hare quotient plus nlargest remainders."""
+    votes = pd.Series(votes, dtype=float)
+    quotient = votes / (votes.sum() / seats)
+    base = quotient.apply(lambda x: int(x))
+    remainder = quotient % 1
+    extra = remainder.nlargest(int(seats - base.sum())).index
+    return (base + votes.index.isin(extra)).to_numpy()
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_hare_matches_original_implementation(seed):
+    rng = np.random.default_rng(seed)
+    votes = rng.pareto(1.2, rng.integers(2, 40)) * 100_000
+    np.testing.assert_array_equal(allocate(votes, 100), _old_hare(votes, 100))
+
+
+def test_known_highest_averages_results():
+    votes = [100, 80, 30, 20]
+    np.testing.assert_array_equal(allocate(votes, 8, method="dhondt"), [4, 3, 1, 0])
+    np.testing.assert_array_equal(allocate(votes, 8, method="sainte-lague"), [3, 3, 1, 1])
+
+
+@pytest.mark.parametrize("method", ["hare", "dhondt", "sainte-lague"])
+def test_threshold_zeroes_small_parties(method):
+    seats = allocate([600, 350, 40, 10], 10, method=method, threshold=0.05)
+    assert seats[2:].tolist() == [0, 0]
+    assert seats.sum() == 10
+
+
+def test_tie_break_order_and_votes():
+    # Both parties are left with a remainder of exactly 0.5 for the last seat
+    votes = [1, 3]
+    np.testing.assert_array_equal(allocate(votes, 2, tie_break="order"), [1, 1])
+    np.testing.assert_array_equal(allocate(votes, 2, tie_break="votes"), [0, 2])
+    # Equal averages under D'Hondt: the earlier column wins with "order"
+    np.testing.assert_array_equal(allocate([10, 10], 1, method="dhondt"), [1, 0])
+
+
+def test_tie_break_random_is_seeded():
+    results = {tuple(allocate([10, 10], 1, tie_break="random", rng=seed)) for seed in range(20)}
+    assert results == {(1, 0), (0, 1)}
+    assert tuple(allocate([10, 10], 1, tie_break="random", rng=3)) == tuple(
+        allocate([10, 10], 1, tie_break="random", rng=3))
+
+
+def test_unknown_options_raise():
+    with pytest.raises(ValueError):
+        allocate([1, 2], 1, method="imperiali")
+    with pytest.raises(ValueError):
+        allocate([1, 2], 1, tie_break="coin")
+    with pytest.raises(ValueError):
+        allocate([1, -2], 1)
+
+
+@pytest.mark.parametrize("method", ["hare", "dhondt", "sainte-lague"])
+def test_rows_without_votes_get_no_seats(method):
+    np.testing.assert_array_equal(allocate([0, 0, 0], 5, method=method), [0, 0, 0])
+    batch = allocate([[0, 0, 0], [5, 3, 2]], 5, method=method)
+    assert batch[0].tolist() == [0, 0, 0]
+    assert batch[1].sum() == 5
+
+
+@pytest.mark.parametrize("method", ["hare", "dhondt", "sainte-lague"])
+def test_batch_equals_rows_allocated_one_by_one(method):
+    votes = np.random.default_rng(7).pareto(1.2, (25, 9)) * 10_000
+    votes[3] = 0
+    batch = allocate(votes, 100, method=method, threshold=0.01)
+    for row, seats in zip(votes, batch):
+        np.testing.assert_array_equal(seats, allocate(row, 100, method=method, threshold=0.01))
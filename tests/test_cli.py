@@ -0,0 +1,53 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from thai_election import cli
+
+
+def test_render_builds_the_summary_table_once(monkeypatch):
+    calls = []
+    real = cli.summary_table
+
+    def counting(source="xlsx"):
+        calls.append(source)
+        return real(source)
+
+    monkeypatch.setattr(cli, "summary_table", counting)
+    cli._payloads.invalidate()
+    payload = json.loads(cli.render("xlsx", "json"))
+    assert calls == ["xlsx"]
+    assert payload["districts"] == 400
+    assert sum(p["total_seats"] for p in payload["parties"]) == 500
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), cli.SummaryHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_failures_return_a_generic_503(server, monkeypatch, caplog):
+    def broken(source, fmt):
+        raise RuntimeError("secret path /srv/creds.json")
+
+    monkeypatch.setattr(cli, "render", broken)
+    with pytest.raises(urllib.error.HTTPError) as info:
+        urllib.request.urlopen(f"{server}/summary.json", timeout=5)
+    assert info.value.code == 503
+    assert b"secret" not in info.value.read()
+    assert "secret path" in caplog.text
+
+
+def test_unknown_paths_are_404(server):
+    with pytest.raises(urllib.error.HTTPError) as info:
+        urllib.request.urlopen(f"{server}/summary.xml", timeout=5)
+    assert info.value.code == 404
@@ -0,0 +1,65 @@
+import pandas.testing as tm
+
+from thai_election.history import History
+from thai_election.incremental import ResultEngine
+from thai_election.loader import process_sheet
+
+
+def _record(history, ts, province, partylist):
+    entry = {"fetched_at": float(ts)}
+    return history.record("Province", province, entry), history.record("Party List", partylist, entry)
+
+
+def _assert_replays(history, snapshots):
+    for ts, (province, partylist) in enumerate(snapshots):
+        state = history.replay(ts)
+        province_df, party_cols = process_sheet(province)
+        partylist_df, _ = process_sheet(partylist)
+        expected = ResultEngine().update(province_df, partylist_df, party_cols)
+        tm.assert_frame_equal(state.summary.sort_index(), expected.summary.sort_index(), check_dtype=False)
+        tm.assert_series_equal(state.pl_calc["Final PL Seats"], expected.pl_calc["Final PL Seats"],
+                               check_dtype=False)
+
+
+def test_replay_matches_a_fresh_engine_at_every_snapshot(tmp_path, snapshot_series):
+    history = History(tmp_path, keyframe_every=5)
+    snapshots = list(snapshot_series(rounds=23, raw=True))
+    for ts, (province, partylist) in enumerate(snapshots):
+        _record(history, ts, province, partylist)
+    kinds = [e["kind"] for e in history.sheet("Province").entries()]
+    assert kinds.count("key") >= 23 // 6 and "delta" in kinds
+    assert history.replay(-1) is None
+    _assert_replays(history, snapshots)
+
+
+def test_a_new_process_continues_the_same_history(tmp_path, snapshot_series):
+    snapshots = list(snapshot_series(rounds=8, raw=True))
+    writer = History(tmp_path, keyframe_every=5)
+    reader = History(tmp_path, keyframe_every=5)
+    for ts, (province, partylist) in enumerate(snapshots[:4]):
+        _record(writer, ts, province, partylist)
+    # The reader re-reads the log appended by the writer
+    assert reader.sheet("Province").timestamps() == [0.0, 1.0, 2.0, 3.0]
+
+    restarted = History(tmp_path, keyframe_every=5)
+    assert _record(restarted, 3, *snapshots[3]) == (None, None)
+    for ts, (province, partylist) in enumerate(snapshots[4:], start=4):
+        _record(restarted, ts, province, partylist)
+    seqs = [e["seq"] for e in restarted.sheet("Province").entries()]
+    assert seqs == list(range(len(seqs)))
+    _assert_replays(reader, snapshots)
+
+
+def test_column_or_id_changes_force_a_keyframe(tmp_path, snapshot_series):
+    history = History(tmp_path, keyframe_every=50)
+    series = snapshot_series(rounds=3, raw=True)
+    province, partylist = next(series)
+    assert _record(history, 0, province, partylist)[0]["kind"] == "key"
+    province, partylist = next(series)
+    assert _record(history, 1, province, partylist)[0]["kind"] == "delta"
+
+    renamed = province.rename(columns={province.columns[-1]: "New Party"})
+    assert _record(history, 2, renamed, partylist)[0]["kind"] == "key"
+    fewer = renamed.iloc[:-1]
+    assert _record(history, 3, fewer, partylist)[0]["kind"] == "key"
+    assert list(history.replay(3).province_df["Constituency_ID"]) == list(fewer["Constituency_ID"])
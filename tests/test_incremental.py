@@ -0,0 +1,114 @@
+import threading
+
+import numpy as np
+import pandas.testing as tm
+
+from thai_election.incremental import ResultEngine
+from thai_election.loader import process_sheet
+
+
+def _assert_same(result, expected):
+    # Parties tied on seats may come out in either order
+    tm.assert_frame_equal(result.summary.sort_index(), expected.summary.sort_index())
+    tm.assert_frame_equal(result.pl_calc, expected.pl_calc)
+    tm.assert_series_equal(result.constituency_seats.sort_index(), expected.constituency_seats.sort_index(),
+                           check_dtype=False)
+    tm.assert_series_equal(result.winners.sort_index(), expected.winners.sort_index())
+    tm.assert_series_equal(result.list_totals, expected.list_totals, check_exact=False, rtol=1e-9)
+    _assert_same_cube(result.cube, expected.cube)
+
+
+def _assert_same_cube(cube, expected):
+    # Groups whose rows were all removed stay in the cube with zeros
+    seats, expected_seats = cube.seats_by("province"), expected.seats_by("province")
+    seats = seats[seats.sum(axis=1) > 0].sort_index()
+    tm.assert_frame_equal(seats, expected_seats.sort_index())
+    tm.assert_frame_equal(cube.votes_by("region").sort_index(), expected.votes_by("region").sort_index(),
+                          check_exact=False, rtol=1e-9)
+
+
+def test_incremental_updates_match_a_fresh_rebuild(snapshot_series):
+    engine = ResultEngine()
+    for province_df, partylist_df, party_cols in snapshot_series():
+        result = engine.update(province_df, partylist_df, party_cols)
+        _assert_same(result, ResultEngine().update(province_df, partylist_df, party_cols))
+
+
+def test_flips_are_reported(election):
+    engine = ResultEngine()
+    province_df, partylist_df, party_cols = election
+    engine.update(province_df, partylist_df, party_cols)
+    changed = province_df.copy()
+    row = changed.index[changed['District_Winner'] != "NO INFORMATION YET"][0]
+    before = changed.loc[row, 'District_Winner']
+    after = next(p for p in party_cols if p != before)
+    changed.loc[row, after] = changed.loc[row, party_cols].max() + 1
+    changed, _ = process_sheet(changed.drop(columns=['District_Winner', 'Winning_Votes']))
+
+    result = engine.update(changed, partylist_df, party_cols)
+    assert [(f.before, f.after) for f in result.changes.flips] == [(before, after)]
+    assert engine.update(changed, partylist_df, party_cols) is result
+
+
+def test_published_result_is_consistent_under_concurrent_updates(snapshot_series):
+    engine = ResultEngine()
+    snapshots = list(snapshot_series(rounds=8))
+    stop = threading.Event()
+    mismatches = []
+
+    def read():
+        while not stop.is_set():
+            result = engine.result
+            list_seats = result.pl_calc["Final PL Seats"].reindex(result.summary.index).fillna(0).astype(int)
+            if not (result.summary["Party List"] == list_seats).all():
+                mismatches.append(result)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for _ in range(5):
+        for snapshot in snapshots:
+            engine.update(*snapshot)
+    stop.set()
+    reader.join()
+    assert not mismatches
+
+
+def test_relabelled_rows_move_to_their_new_group(election):
+    engine = ResultEngine()
+    province_df, partylist_df, party_cols = election
+    engine.update(province_df, partylist_df, party_cols)
+    moved = province_df.copy()
+    rows = moved.index[moved['District_Winner'] != "NO INFORMATION YET"][:3]
+    moved.loc[rows, 'Province (English)'] = "Renamed"
+    moved.loc[rows, 'Region'] = "Elsewhere"
+
+    result = engine.update(moved, partylist_df, party_cols)
+    assert result.cube.province("Renamed")[1].sum() == 3
+    _assert_same(result, ResultEngine().update(moved, partylist_df, party_cols))
+
+
+def test_published_cube_is_not_modified_by_later_updates(snapshot_series):
+    engine = ResultEngine()
+    snapshots = snapshot_series(rounds=5)
+    first = engine.update(*next(snapshots))
+    votes, seats = first.cube.votes_by("province").copy(), first.cube.seats_by("province").copy()
+    for snapshot in snapshots:
+        assert engine.update(*snapshot).cube is not first.cube
+    tm.assert_frame_equal(first.cube.votes_by("province"), votes)
+    tm.assert_frame_equal(first.cube.seats_by("province"), seats)
+
+
+def test_reordered_rows_match_a_fresh_rebuild(election):
+    engine = ResultEngine()
+    rng = np.random.default_rng(4)
+    province_df, partylist_df, party_cols = election
+    engine.update(province_df, partylist_df, party_cols)
+    for _ in range(3):
+        # Someone sorts the live sheet, and one district reports more votes
+        province_df = province_df.iloc[rng.permutation(len(province_df))].drop(
+            columns=['District_Winner', 'Winning_Votes'])
+        partylist_df = partylist_df.iloc[rng.permutation(len(partylist_df))]
+        province_df.loc[province_df.index[0], party_cols[0]] += 50000
+        province_df, _ = process_sheet(province_df)
+        result = engine.update(province_df, partylist_df, party_cols)
+        _assert_same(result, ResultEngine().update(province_df, partylist_df, party_cols))
@@ -0,0 +1,146 @@
+import asyncio
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from thai_election.ingest import SheetPoller, SnapshotError, SnapshotStore, validate
+
+HEADER = "Province (English),District,Province,Constituency_ID,Region,{parties}\n"
+
+
+def _sheet(parties=("A", "B"), rows=(("10", "5"), ("0", "7"))):
+    lines = ["title row\n", HEADER.format(parties=",".join(parties))]
+    for i, votes in enumerate(rows, start=1):
+        lines.append(f"Krabi,{i},กระบี่,KBI-{i},South,{','.join(votes)}\n")
+    return "".join(lines).encode()
+
+
+class StandIn(BaseHTTPRequestHandler):
+    """Serves ``server.bodies[path]``; ETags unless ``server.etags`` is off, ``server.status`` forces errors."""
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.server.status != 200:
+            self.send_error(self.server.status)
+            return
+        body = self.server.bodies[self.path]
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if self.server.etags and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv")
+        self.send_header("Content-Length", str(len(body)))
+        if self.server.etags:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    httpd.bodies = {"/Province.csv": _sheet(), "/Party_List.csv": _sheet()}
+    httpd.etags = True
+    httpd.status = 200
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _poller(server, tmp_path, sheets=("Province",), interval=10.0):
+    port = server.server_address[1]
+    return SheetPoller(
+        SnapshotStore(tmp_path / "store"), sheets=sheets, interval=interval,
+        url_for=lambda sheet: f"http://127.0.0.1:{port}/{sheet.replace(' ', '_')}.csv", timeout=5,
+    )
+
+
+def _poll(poller, force=True):
+    return {r.sheet: r for r in asyncio.run(poller.poll_once(force=force))}
+
+
+def test_new_content_is_stored(server, tmp_path):
+    poller = _poller(server, tmp_path)
+    result = _poll(poller)["Province"]
+    assert result.status == "updated"
+    assert poller.store.version("Province") == 1
+    assert poller.store.path("Province").read_bytes() == server.bodies["/Province.csv"]
+
+
+def test_not_modified_keeps_the_snapshot(server, tmp_path):
+    poller = _poller(server, tmp_path)
+    _poll(poller)
+    result = _poll(poller)["Province"]
+    assert (result.status, result.detail) == ("unchanged", "304 Not Modified")
+    assert poller.store.version("Province") == 1
+
+
+def test_same_body_without_etag_is_unchanged(server, tmp_path):
+    server.etags = False
+    poller = _poller(server, tmp_path)
+    _poll(poller)
+    result = _poll(poller)["Province"]
+    assert (result.status, result.detail) == ("unchanged", "same content")
+    assert poller.store.version("Province") == 1
+
+    server.bodies["/Province.csv"] = _sheet(rows=(("11", "5"), ("0", "7")))
+    assert _poll(poller)["Province"].status == "updated"
+    assert poller.store.version("Province") == 2
+
+
+def test_errors_back_off_exponentially_and_recover(server, tmp_path):
+    server.status = 500
+    poller = _poller(server, tmp_path, interval=10.0)
+    delays = []
+    for _ in range(3):
+        before = time.monotonic()
+        assert _poll(poller)["Province"].status == "error"
+        delays.append(poller._next_due["Province"] - before)
+    for failures, delay in enumerate(delays, start=1):
+        assert 10.0 * 2 ** failures * 0.8 <= delay <= 10.0 * 2 ** failures * 1.2 + 1
+
+    # Not due yet: an unforced poll leaves the sheet alone
+    requests = len(server.requests)
+    assert _poll(poller, force=False) == {}
+    assert len(server.requests) == requests
+
+    server.status = 200
+    assert _poll(poller)["Province"].status == "updated"
+    assert poller._failures["Province"] == 0
+
+
+def test_party_list_must_match_the_province_sheet(server, tmp_path):
+    poller = _poller(server, tmp_path, sheets=("Province", "Party List"))
+    server.bodies["/Party_List.csv"] = _sheet(parties=("A", "C"))
+    results = _poll(poller)
+    assert results["Province"].status == "updated"
+    assert results["Party List"].status == "error"
+    assert poller.store.entry("Party List") is None
+
+    # A new party appearing in both sheets in the same poll is accepted
+    server.bodies["/Province.csv"] = _sheet(parties=("A", "B", "C"), rows=(("1", "2", "3"),))
+    server.bodies["/Party_List.csv"] = _sheet(parties=("A", "B", "C"), rows=(("4", "5", "6"),))
+    results = _poll(poller)
+    assert [results[s].status for s in ("Province", "Party List")] == ["updated", "updated"]
+
+
+def test_validate_rejects_non_numeric_or_missing_party_columns():
+    assert list(validate("Party List", _sheet())["A"]) == [10, 0]
+    validate("Party List", _sheet(rows=(("10", ""), ("0", "7"))))
+    with pytest.raises(SnapshotError, match="non-numeric"):
+        validate("Party List", _sheet(rows=(("10", "twelve"), ("0", "7"))))
+    with pytest.raises(SnapshotError, match="no party columns"):
+        validate("Province", _sheet(parties=()))
+    with pytest.raises(SnapshotError, match="differ"):
+        validate("Party List", _sheet(), parties=["A", "B", "C"])
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from thai_election.loader import NO_INFO
+from thai_election.model import election_model
+
+
+def test_totals_match_the_sheets_exactly(election):
+    province, partylist, party_cols = election
+    model = election_model(province, partylist, party_cols)
+    pd.testing.assert_series_equal(model.constituency_totals, province[party_cols].sum())
+    pd.testing.assert_series_equal(model.list_totals, partylist[party_cols].sum())
+    np.testing.assert_array_equal(model.winning_votes, province["Winning_Votes"].to_numpy())
+
+
+def test_fractional_close_races_keep_their_winner(make_election):
+    province, partylist, party_cols = make_election(close_race=True)
+    b = party_cols[1]
+    model = election_model(province, partylist, party_cols)
+    assert model.winner_labels[0] == b == province.loc[0, "District_Winner"]
+    assert model.winning_votes[0] == 1000.45
+    assert list(model.winner_labels) == list(province["District_Winner"])
+    assert model.seat_counts.to_dict() == province["District_Winner"].value_counts().to_dict()
+    assert NO_INFO in model.seat_counts.index
+
+
+def test_models_are_shared_per_snapshot_and_read_only(election):
+    province, partylist, party_cols = election
+    model = election_model(province, partylist, party_cols)
+    assert election_model(province, partylist, party_cols) is model
+    assert not model.votes.flags.writeable
+
+
+def test_sheets_without_region_get_unlabelled_rows(make_election):
+    province, partylist, party_cols = make_election(region=False)
+    model = election_model(province, partylist, party_cols)
+    assert len(model.region.categories) == 0
+    assert (model.region.codes == -1).all() and (model.list_region.codes == -1).all()
+    pd.testing.assert_series_equal(model.constituency_totals, province[party_cols].sum())
@@ -0,0 +1,66 @@
+import pandas as pd
+import pytest
+
+from thai_election.parties import PartyIndex, build_parties, normalize, parse_registry_html
+
+
+@pytest.mark.parametrize("name", [
+    "เพื่อไทย", "พรรคเพื่อไทย", "พรรค เพื่อไทย", " เพื่อไทย ",
+    '"พรรคเพื่อไทย"', "'พรรคเพื่อไทย", "“เพื่อไทย”",
+])
+def test_thai_spellings_normalise_alike(name):
+    assert normalize(name) == normalize("เพื่อไทย")
+
+
+@pytest.mark.parametrize("name", ["Pheu Thai Party", "PHEU THAI", "pheu-thai", "Pheu Thai’", "'Pheu Thai'"])
+def test_english_spellings_normalise_alike(name):
+    assert normalize(name) == normalize("Pheu Thai")
+
+
+def test_codes_ignore_leading_zeros():
+    assert normalize("034") == normalize("34") == "34"
+    assert normalize("0") == "0"
+    assert normalize("พรรค") == "พรรค"
+
+
+def test_parse_registry_html_reads_plain_and_escaped_records():
+    html = (
+        '<script>var parties = [{"code":"034","name_th":"เพื่อไทย","name_en":"Pheu Thai Party"}];'
+        'self.__next_f.push([1,"{\\"code\\":\\"173\\",\\"name_th\\":\\"เศรษฐกิจ\\",'
+        '\\"name_en\\":\\"Economic Party\\"},{\\"code\\":\\"009\\",\\"name_th\\":\\"ไทยภักดี\\",'
+        '\\"name_en\\":\\"Thai Pakdee\\\'s Party\\"}"])</script>'
+    )
+    registry = parse_registry_html(html)
+    assert list(registry["Party Code"]) == ["034", "173", "009"]
+    assert list(registry["Thai Name"]) == ["เพื่อไทย", "เศรษฐกิจ", "ไทยภักดี"]
+    assert registry["English Name"].iloc[2] == "Thai Pakdee's Party"
+    assert parse_registry_html("<html></html>").empty
+
+
+def test_build_parties_merges_registry_and_colour_sheet():
+    registry = pd.DataFrame({
+        "Party Code": ["034", "173", "200"],
+        "Thai Name": ["เพื่อไทย", "เศรษฐกิจ", "ทดลอง"],
+        "English Name": ["Pheu Thai Party", "Economic Party", "Test Party"],
+    })
+    colors = pd.DataFrame({
+        "code": ["34.0", "173", None],
+        "english": ["Pheu Thai", None, "Independent"],
+        "thai": [None, "พรรคเศรษฐกิจ", "อิสระ"],
+        "color": ["#E3000F", "#00AEEF", None],
+    })
+    parties = {p.code or p.thai_name: p for p in build_parties(registry, colors)}
+    assert len(parties) == 4
+    # Colour sheet names win, blanks fall back to the registry
+    assert (parties["34"].thai_name, parties["34"].english_name, parties["34"].color) == \
+        ("เพื่อไทย", "Pheu Thai", "#E3000F")
+    assert (parties["173"].thai_name, parties["173"].english_name) == ("พรรคเศรษฐกิจ", "Economic Party")
+    assert parties["200"].color is None
+    assert parties["อิสระ"].code == "" and parties["อิสระ"].color is None
+
+    index = PartyIndex(parties.values())
+    assert index.code("'พรรคเพื่อไทย'") == "34"
+    assert index.english("เศรษฐกิจ") == "Economic Party"
+    assert index.color("Pheu Thai Party") == "#E3000F"
+    assert index.color("Unknown", default="#000") == "#000"
+    assert index.english("Unknown") == "Unknown"
@@ -0,0 +1,35 @@
+import numpy as np
+
+from thai_election.incremental import ResultEngine
+from thai_election.projection import _cache, project
+
+
+def test_project_without_region_column(make_election):
+    province, partylist, party_cols = make_election(districts=40, parties=4, region=False)
+    result = project(province, partylist, party_cols, n_scenarios=50, seed=1)
+    assert result.constituency.shape == (50, 4)
+
+
+def test_project_with_region_column_is_cached_per_snapshot(make_election):
+    province, partylist, party_cols = make_election(districts=40, parties=4)
+    first = project(province, partylist, party_cols, n_scenarios=50, seed=1)
+    assert project(province.copy(), partylist.copy(), party_cols, n_scenarios=50, seed=1) is first
+    np.testing.assert_array_equal(first.constituency.sum(axis=1), 40)
+
+
+def test_without_noise_a_fully_reported_sheet_reproduces_the_engine(make_election):
+    province, partylist, party_cols = make_election(reported=1.0, seed=8)
+    result = project(province, partylist, party_cols, n_scenarios=20, seed=0,
+                     swing_sd=0.0, concentration=1e12, list_concentration=1e12)
+    engine = ResultEngine().update(province, partylist, party_cols)
+    constituency = engine.constituency_seats.reindex(party_cols).fillna(0).astype(int).to_numpy()
+    party_list = engine.pl_calc["Final PL Seats"].reindex(party_cols).to_numpy()
+    assert (result.constituency == constituency).all()
+    assert (result.party_list == party_list).all()
+
+
+def test_cache_is_bounded(make_election):
+    province, partylist, party_cols = make_election(districts=40, parties=4)
+    for n in range(20, 40):
+        project(province, partylist, party_cols, n_scenarios=n, seed=1)
+    assert len(_cache.keys()) <= 8
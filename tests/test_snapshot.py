@@ -0,0 +1,68 @@
+import os
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate, write_workbook
+from thai_election import snapshot
+from thai_election.loader import SHEETS
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    return write_workbook(tmp_path / "results.xlsx", *generate(60, 5, reported=0.8, seed=2))
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Count how often ``build`` opens the xlsx."""
+    calls = []
+    excel_file = pd.ExcelFile
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return excel_file(*args, **kwargs)
+
+    monkeypatch.setattr(snapshot.pd, "ExcelFile", counting)
+    return calls
+
+
+def test_read_sheet_matches_read_excel(workbook, tmp_path):
+    for sheet, (_, header) in SHEETS.items():
+        expected = pd.read_excel(workbook, header=header, sheet_name=sheet)
+        pd.testing.assert_frame_equal(snapshot.read_sheet(sheet, workbook, tmp_path / "cache"), expected)
+
+
+def test_touched_workbook_is_rekeyed_without_parsing(workbook, tmp_path, parses):
+    cache_dir = tmp_path / "cache"
+    sheet_dir = snapshot.build(workbook, cache_dir)
+    assert len(parses) == 1
+    assert snapshot.build(workbook, cache_dir) == sheet_dir
+    assert len(parses) == 1
+
+    stat = workbook.stat()
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    snapshot.build(workbook, cache_dir)
+    assert len(parses) == 1
+    assert snapshot._read_manifest(sheet_dir)["mtime_ns"] == stat.st_mtime_ns + 10**9
+
+
+def test_changed_workbook_is_rebuilt(workbook, tmp_path, parses):
+    cache_dir = tmp_path / "cache"
+    snapshot.build(workbook, cache_dir)
+    province, partylist, coordinates = generate(60, 5, reported=1.0, seed=3)
+    write_workbook(workbook, province, partylist, coordinates)
+    pd.testing.assert_frame_equal(
+        snapshot.read_sheet("Province", workbook, cache_dir),
+        pd.read_excel(workbook, header=SHEETS["Province"][1], sheet_name="Province"),
+    )
+    assert len(parses) == 2
+
+
+def test_missing_sheet_file_forces_a_rebuild(workbook, tmp_path, parses):
+    cache_dir = tmp_path / "cache"
+    sheet_dir = snapshot.build(workbook, cache_dir)
+    (sheet_dir / snapshot._sheet_file("Coordinates")).unlink()
+    snapshot.build(workbook, cache_dir)
+    assert len(parses) == 2
+    assert (sheet_dir / snapshot._sheet_file("Coordinates")).exists()
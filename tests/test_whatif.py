@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from thai_election.incremental import ResultEngine
+from thai_election.model import election_model
+from thai_election.whatif import SwingBase
+
+
+@pytest.mark.parametrize("close_race", [False, True])
+def test_zero_swing_reproduces_the_engine(make_election, close_race):
+    province, partylist, party_cols = make_election(seed=5, close_race=close_race)
+    expected = ResultEngine().update(province, partylist, party_cols).summary
+    base = SwingBase(election_model(province, partylist, party_cols))
+    for result in (base.base, base.simulate(party_cols[0], party_cols[1], national=0.0)):
+        assert not result.flipped.any()
+        pd.testing.assert_frame_equal(result.summary().sort_index(), expected.sort_index(),
+                                      check_dtype=False, check_names=False)
+
+
+def test_swing_moves_votes_and_seats(make_election):
+    province, partylist, party_cols = make_election(seed=5)
+    base = SwingBase(election_model(province, partylist, party_cols))
+    source, target = party_cols[0], party_cols[1]
+    result = base.simulate(source, target, national=5.0)
+    i, j = base.party_index(source), base.party_index(target)
+    assert result.total_seats[i] <= base.base.total_seats[i]
+    assert result.total_seats[j] >= base.base.total_seats[j]
+    assert result.total_seats.sum() == base.base.total_seats.sum()
+    # Every flip either went to the party gaining votes or away from the one losing them
+    flips = result.flipped
+    assert ((result.winner[flips] == j) | (base.base.winner[flips] == i)).all()
+    back = base.simulate(source, target, national=-5.0)
+    assert back.total_seats[i] >= base.base.total_seats[i]
+    np.testing.assert_array_equal(
+        base.simulate(source, target, national=0.0, by_region={base.regions[0]: 0.0}).winner, base.base.winner)
+
+
+def test_swing_without_region_column(make_election):
+    province, partylist, party_cols = make_election(region=False)
+    base = SwingBase(election_model(province, partylist, party_cols))
+    assert base.regions == ()
+    result = base.simulate(party_cols[0], party_cols[1], national=3.0, by_region={})
+    assert result.total_seats.sum() == base.base.total_seats.sum()
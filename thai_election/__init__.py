@@ -0,0 +1,5 @@
+"""Shared data and seat-calculation code for the Thailand Election 2026 dashboard.
+
+The Streamlit pages (``Parliament_Seats.py`` and ``pages/``) import from here so
+that expensive work happens once per process rather than once per rerun.
+"""
@@ -0,0 +1,3 @@
+from thai_election.cli import main
+
+main()
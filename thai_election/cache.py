@@ -0,0 +1,80 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Thread-safe, process-wide cache shared by every Streamlit session.
+
+    Entries can expire after ``ttl`` seconds and carry an optional ``version``
+    (e.g. a file mtime); a lookup with a different version is a miss. With
+    ``maxsize`` the least recently used entries are dropped beyond that many.
+    Values are returned as-is, so callers must treat cached DataFrames as
+    read-only.
+    """
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, stored_at, ttl, version)
+        self._key_locks = {}
+
+    def _fresh(self, key, version):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, stored_at, ttl, entry_version = entry
+        if entry_version != version:
+            return None
+        if ttl is not None and time.monotonic() - stored_at > ttl:
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get_or_compute(self, key, compute, ttl=None, version=None):
+        with self._lock:
+            entry = self._fresh(key, version)
+            if entry is not None:
+                return entry[0]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Only one session computes a given key; the others wait and reuse it.
+        with key_lock:
+            with self._lock:
+                entry = self._fresh(key, version)
+                if entry is not None:
+                    return entry[0]
+            value = compute()
+            with self._lock:
+                self._entries[key] = (value, time.monotonic(), ttl, version)
+                self._entries.move_to_end(key)
+                while self.maxsize is not None and len(self._entries) > self.maxsize:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._key_locks.pop(evicted, None)
+            return value
+
+    def invalidate(self, predicate=None):
+        """Drop every entry, or only those whose key matches ``predicate``."""
+        with self._lock:
+            if predicate is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if predicate(k)]:
+                    del self._entries[key]
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries)
+
+
+def frame_digest(df, columns=None):
+    """Stable content hash of a DataFrame (optionally restricted to ``columns``)."""
+    import pandas as pd
+
+    if columns is not None:
+        df = df[list(columns)]
+    h = hashlib.blake2b(digest_size=16)
+    h.update("\x1f".join(map(str, df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
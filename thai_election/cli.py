@@ -0,0 +1,161 @@
+"""Headless seat results for feeds, cron jobs and small HTTP handlers.
+
+Usage::
+
+    python -m thai_election summarize --source xlsx --format json
+    python -m thai_election summarize --source live --format csv -o seats.csv
+    python -m thai_election serve --port 8000      # GET /summary.json?source=live
+    python -m thai_election build-cache
+    python -m thai_election poll --once
+
+Only pandas/numpy are imported up front; nothing here touches plotly or
+streamlit, so a summary is produced in well under a second.
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from thai_election.cache import TTLCache, frame_digest
+from thai_election.incremental import shared_engine
+from thai_election.loader import NO_INFO, load_election_data
+from thai_election.parties import party_index
+
+SOURCES = ("xlsx", "live")
+FORMATS = ("json", "csv")
+
+_payloads = TTLCache(maxsize=16)
+
+log = logging.getLogger(__name__)
+
+
+def summary_table(source="xlsx"):
+    """Seat summary for ``source`` with each party's list votes alongside."""
+    province_df, partylist_df, party_cols = load_election_data(live=source == "live")
+    result = shared_engine(source).update(province_df, partylist_df, party_cols)
+    table = result.summary.copy()
+    table["List Votes"] = result.pl_calc["Total Votes"].reindex(table.index).fillna(0)
+    table.index.name = "Party"
+    reported = int((result.winners != NO_INFO).sum())
+    return table, reported, len(result.winners)
+
+
+def summarize(source="xlsx", summary=None):
+    """JSON-ready dict of the current seat result (``summary`` reuses a ``summary_table`` result)."""
+    table, reported, districts = summary or summary_table(source)
+    registry = party_index()
+    return {
+        "source": source,
+        "computed_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "districts_reported": reported,
+        "districts": districts,
+        "parties": [
+            {
+                "party": party,
+                "party_code": registry.code(party),
+                "english_name": registry.english(party),
+                "constituency_seats": int(row["Constituency Seats"]),
+                "party_list_seats": int(row["Party List"]),
+                "total_seats": int(row["Total"]),
+                "list_votes": float(row["List Votes"]),
+            }
+            for party, row in table.iterrows()
+        ],
+    }
+
+
+def render(source="xlsx", fmt="json"):
+    """Serialised summary as bytes, reused until the underlying result changes."""
+    summary = summary_table(source)
+    table = summary[0]
+
+    def build():
+        if fmt == "csv":
+            return table.to_csv().encode("utf-8")
+        return json.dumps(summarize(source, summary), ensure_ascii=False, indent=2).encode("utf-8")
+
+    return _payloads.get_or_compute((source, fmt), build, version=frame_digest(table))
+
+
+class SummaryHandler(BaseHTTPRequestHandler):
+    """Serves ``/summary.json`` and ``/summary.csv`` (``?source=xlsx|live``)."""
+
+    default_source = "xlsx"
+    content_types = {"json": "application/json; charset=utf-8", "csv": "text/csv; charset=utf-8"}
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        fmt = url.path.rsplit(".", 1)[-1] if url.path.startswith("/summary.") else None
+        source = parse_qs(url.query).get("source", [self.default_source])[0]
+        if fmt not in FORMATS or source not in SOURCES:
+            self.send_error(404)
+            return
+        try:
+            body = render(source, fmt)
+        except Exception:
+            # Details stay in the server log; clients only learn to retry
+            log.exception("Building the %s summary for %r failed", fmt, source)
+            self.send_error(503, "Summary temporarily unavailable")
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", self.content_types[fmt])
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m thai_election", description="Thai election seat results without Streamlit.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    summarize_parser = commands.add_parser("summarize", help="print the current seat summary")
+    summarize_parser.add_argument("--source", choices=SOURCES, default="xlsx")
+    summarize_parser.add_argument("--format", choices=FORMATS, default="json")
+    summarize_parser.add_argument("-o", "--output", help="write to a file instead of stdout")
+
+    serve_parser = commands.add_parser("serve", help="serve /summary.json and /summary.csv over HTTP")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", default=8000, type=int)
+    serve_parser.add_argument("--source", choices=SOURCES, default="xlsx", help="default when ?source= is absent")
+    serve_parser.add_argument("--poll", action="store_true", help="also run the live sheet poller in this process")
+
+    commands.add_parser("build-cache", help="pre-build the columnar workbook cache", add_help=False)
+    commands.add_parser("poll", help="poll the live sheet into the snapshot store", add_help=False)
+
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # These two forward their own options to the existing module CLIs
+    if argv[:1] == ["build-cache"]:
+        from thai_election.snapshot import main as build_cache
+        return build_cache(argv[1:])
+    if argv[:1] == ["poll"]:
+        from thai_election.ingest import main as poll
+        return poll(argv[1:])
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if args.command == "summarize":
+        started = time.perf_counter()
+        body = render(args.source, args.format)
+        if args.output:
+            with open(args.output, "wb") as f:
+                f.write(body)
+            print(f"Wrote {args.output} in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+        else:
+            sys.stdout.buffer.write(body)
+            sys.stdout.buffer.write(b"\n")
+    elif args.command == "serve":
+        if args.poll:
+            from thai_election.ingest import ensure_background_poller
+            ensure_background_poller()
+        SummaryHandler.default_source = args.source
+        server = ThreadingHTTPServer((args.host, args.port), SummaryHandler)
+        print(f"Serving seat summaries on http://{args.host}:{args.port}/summary.json", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
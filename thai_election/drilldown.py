@@ -0,0 +1,118 @@
+"""Per-snapshot lookup structure for district drill-downs.
+
+``constituency_index(province_df, party_cols)`` is built once per data
+snapshot: a ``Constituency_ID`` -> row dict plus precomputed top-k parties,
+votes and margins for every district, so a click or search is a dict lookup
+instead of a string scan and a sort.
+"""
+import threading
+import weakref
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+TOP_K = 5
+
+
+@dataclass(frozen=True)
+class DistrictResult:
+    constituency_id: str
+    province: str
+    district: str
+    region: str
+    parties: tuple
+    votes: tuple
+    total_votes: float
+    margin: float
+
+    @property
+    def winner(self):
+        return self.parties[0] if self.votes and self.votes[0] > 0 else None
+
+    def votes_frame(self):
+        return pd.DataFrame({'Party': list(self.parties), 'Votes': list(self.votes)})
+
+
+class ConstituencyIndex:
+    def __init__(self, province_df, party_cols, k=TOP_K):
+        party_cols = list(party_cols)
+        votes = province_df[party_cols].to_numpy(dtype=float)
+        k = min(k, len(party_cols))
+        order = np.argsort(-votes, axis=1, kind="stable")[:, :k]
+        top_votes = np.take_along_axis(votes, order, axis=1)
+
+        self.ids = province_df['Constituency_ID'].astype(str).tolist()
+        self.party_cols = party_cols
+        self.top_parties = np.asarray(party_cols, dtype=object)[order]
+        self.top_votes = top_votes
+        self.total_votes = votes.sum(axis=1)
+        self.margin = top_votes[:, 0] - top_votes[:, 1] if k > 1 else top_votes[:, 0]
+        self._positions = {cid: i for i, cid in enumerate(self.ids)}
+
+        def column(name):
+            if name not in province_df:
+                return [""] * len(self.ids)
+            return province_df[name].astype(str).tolist()
+
+        self._province = column('Province (English)')
+        self._district = column('District')
+        self._region = column('Region')
+        self._results = {}
+
+    def __contains__(self, constituency_id):
+        return str(constituency_id) in self._positions
+
+    def __len__(self):
+        return len(self.ids)
+
+    def position(self, constituency_id):
+        return self._positions.get(str(constituency_id))
+
+    def get(self, constituency_id):
+        """``DistrictResult`` for ``constituency_id`` (None if unknown)."""
+        i = self.position(constituency_id)
+        if i is None:
+            return None
+        result = self._results.get(i)
+        if result is None:
+            result = DistrictResult(
+                constituency_id=self.ids[i],
+                province=self._province[i],
+                district=self._district[i],
+                region=self._region[i],
+                parties=tuple(self.top_parties[i]),
+                votes=tuple(self.top_votes[i].tolist()),
+                total_votes=float(self.total_votes[i]),
+                margin=float(self.margin[i]),
+            )
+            self._results[i] = result
+        return result
+
+
+_lock = threading.Lock()
+_indexes = {}  # id(province_df) -> (weakref to the frame, {(party_cols, k): index})
+
+
+def _forget(frame_id):
+    with _lock:
+        _indexes.pop(frame_id, None)
+
+
+def constituency_index(province_df, party_cols, k=TOP_K):
+    """The index for this exact snapshot frame, built on first use.
+
+    Snapshot frames are shared and never modified, so the index lives as long
+    as the frame it was built from.
+    """
+    key = (tuple(party_cols), k)
+    frame_id = id(province_df)
+    with _lock:
+        entry = _indexes.get(frame_id)
+        if entry is None or entry[0]() is not province_df:
+            entry = (weakref.ref(province_df, lambda _: _forget(frame_id)), {})
+            _indexes[frame_id] = entry
+        index = entry[1].get(key)
+        if index is None:
+            index = entry[1][key] = ConstituencyIndex(province_df, party_cols, k)
+        return index
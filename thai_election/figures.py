@@ -0,0 +1,153 @@
+"""Plotly figures for the pages, cached per data snapshot.
+
+Every builder is keyed by a content hash of the data it draws plus its
+parameters, so a rerun with unchanged data reuses the same figure object
+instead of rebuilding it through plotly express. Streamlit still turns the
+figure into JSON on each rerun, but that payload is byte-identical, so
+browsers that already have it are sent a cache reference rather than the
+figure again.
+
+``lean=True`` trades detail for payload size: WebGL traces, no per-point
+text labels, and hover limited to the one field needed for identification.
+"""
+import plotly.express as px
+
+from thai_election.cache import TTLCache, frame_digest
+from thai_election.parliament import create_parliament_data
+
+_cache = TTLCache(maxsize=64)
+
+
+def _cached(name, frames, params, build):
+    key = (name, tuple(frame_digest(f) for f in frames), params)
+    return _cache.get_or_compute(key, build)
+
+
+def _colors_key(colors):
+    return tuple(sorted(colors.items()))
+
+
+def arc_figure(summary, province_df, colors, lean=False):
+    """Hemicycle of all seats, coloured by party."""
+    cols = ['District_Winner', 'Province (English)', 'District']
+
+    def build():
+        coords = create_parliament_data(summary, province_df)
+        custom_data = ["Party"] if lean else ["Party", "Location"]
+        fig = px.scatter(
+            coords, x="x", y="y", color="Party",
+            color_discrete_map=colors,
+            custom_data=custom_data,
+            category_orders={"Party": summary.index.tolist()},
+            render_mode="webgl" if lean else "auto",
+        )
+        hovertemplate = ("<b>%{customdata[0]}</b><extra></extra>" if lean
+                         else "<b>%{customdata[0]}</b><br>%{customdata[1]}<extra></extra>")
+        fig.update_traces(
+            hovertemplate=hovertemplate,
+            marker=dict(size=14, line=dict(width=0 if lean else 1, color='white'))
+        )
+        fig.update_layout(
+            xaxis=dict(visible=False), yaxis=dict(visible=False),
+            plot_bgcolor="rgba(0,0,0,0)", height=600,
+            legend=dict(orientation="h", y=-0.1, x=0.5, xanchor="center")
+        )
+        return fig
+
+    return _cached("arc", (summary, province_df[cols]), (_colors_key(colors), lean), build)
+
+
+def pie_figure(summary, colors):
+    def build():
+        # Using 'Seats' as the numeric value ensures proportional slices
+        return px.pie(summary, values="Total", names=summary.index.tolist(),
+                      color=summary.index.tolist(), color_discrete_map=colors, hole=0.2)
+
+    return _cached("pie", (summary,), _colors_key(colors), build)
+
+
+def district_map_figure(plot_df, colors, zoom, marker_size, text_size, lean=False):
+    """One bubble per district; ``hover_name`` is the Constituency_ID used for clicks."""
+    cols = ['Lat_Jitter', 'Lon_Jitter', 'District', 'District_Winner', 'Winning_Votes', 'Constituency_ID']
+
+    def build():
+        df = plot_df[cols]
+        if lean:
+            # ~1 m precision is plenty for a bubble and shortens every coordinate
+            df = df.assign(Lat_Jitter=df['Lat_Jitter'].round(5), Lon_Jitter=df['Lon_Jitter'].round(5))
+        fig = px.scatter_mapbox(
+            df,
+            lat="Lat_Jitter",
+            lon="Lon_Jitter",
+            text=None if lean else "District",
+            color="District_Winner",
+            color_discrete_map=colors,
+            hover_name="Constituency_ID",
+            hover_data={
+                "District": False,
+                "District_Winner": not lean,
+                "Winning_Votes": not lean,
+                "Lat_Jitter": False,
+                "Lon_Jitter": False
+            },
+            zoom=zoom,
+            center={"lat": 13.7367, "lon": 100.5231},
+            mapbox_style="carto-positron",
+            height=1000
+        )
+        if lean:
+            fig.update_traces(marker=dict(size=marker_size, opacity=0.8), mode="markers")
+        else:
+            fig.update_traces(marker=dict(size=marker_size, opacity=0.8),
+                              textfont=dict(size=text_size, color='white'), hoverinfo=None)
+        return fig
+
+    params = (_colors_key(colors), zoom, marker_size, text_size, lean)
+    return _cached("district_map", (plot_df[cols],), params, build)
+
+
+def votes_bar_figure(votes_df, colors, title=None, **layout):
+    """Horizontal bar of ``Party`` vs ``Votes``."""
+    def build():
+        fig = px.bar(
+            votes_df,
+            x='Votes',
+            y='Party',
+            orientation='h',
+            color='Party',
+            color_discrete_map=colors,
+            text_auto=',.0f',
+            title=title,
+        )
+        fig.update_layout(showlegend=False, xaxis_title="Total Votes", yaxis_title="", **layout)
+        return fig
+
+    params = (_colors_key(colors), title, repr(sorted(layout.items())))
+    return _cached("votes_bar", (votes_df,), params, build)
+
+
+def seats_bar_figure(constituency_winners, colors):
+    """Constituency seats won per party, largest at the top."""
+    def build():
+        fig = px.bar(
+            constituency_winners,
+            x="count",
+            y=constituency_winners.index,
+            orientation='h',
+            color=constituency_winners.index,
+            color_discrete_map=colors,
+            text_auto=True,  # Automatically adds the count number on the bar
+            labels={'count': 'Number of Seats', 'index': 'Party'},
+            title="Constituency Seats Won by Party"
+        )
+        # Sorting: This ensures the largest party is at the top
+        fig.update_layout(
+            yaxis={'categoryorder': 'total ascending'},
+            yaxis_title="",
+            showlegend=False,  # Party names are already on the Y-axis
+            margin=dict(l=20, r=20, t=30, b=20)
+        )
+        return fig
+
+    frame = constituency_winners.to_frame()
+    return _cached("seats_bar", (frame,), _colors_key(colors), build)
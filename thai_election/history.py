@@ -0,0 +1,257 @@
+"""Append-only history of ingested snapshots with fast replay.
+
+Each sheet gets its own directory with an append-only ``log.jsonl`` and one
+Feather file per entry. An entry is either a keyframe (the full sheet) or a
+delta holding only the ``Constituency_ID`` rows whose votes changed. A new
+keyframe is written every ``keyframe_every`` deltas, or whenever the columns
+or set of constituencies change, so rebuilding any moment reads one
+memory-mapped keyframe plus a bounded number of small deltas.
+
+``replay(timestamp)`` rebuilds winners, ``summary`` and ``pl_calc`` as they
+stood at that time.
+"""
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+
+from thai_election.loader import party_columns
+from thai_election.results import district_winners, party_list_table, seat_summary
+
+KEYFRAME_EVERY = 50
+ID_COL = "Constituency_ID"
+
+
+def _party_cols(df):
+    return party_columns(df.columns)
+
+
+def _votes(df, party_cols):
+    return df[party_cols].apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy(dtype=float, copy=True)
+
+
+class SheetHistory:
+    """History of one sheet; see the module docstring for the on-disk layout."""
+
+    def __init__(self, root, keyframe_every=KEYFRAME_EVERY):
+        self.root = Path(root)
+        self.keyframe_every = keyframe_every
+        self._lock = threading.RLock()
+        self._entries = None
+        self._log_offset = 0
+        self._last = None  # (ids, party_cols, votes) of the newest entry
+        self._frames = OrderedDict()  # loaded / parsed entry files, small LRU
+
+    @property
+    def log_path(self):
+        return self.root / "log.jsonl"
+
+    def entries(self):
+        """Log entries, picking up lines appended by other processes since the last call."""
+        with self._lock:
+            if self._entries is None:
+                self._entries, self._log_offset = [], 0
+            try:
+                size = self.log_path.stat().st_size
+            except FileNotFoundError:
+                return self._entries
+            if size > self._log_offset:
+                with open(self.log_path, "rb") as f:
+                    f.seek(self._log_offset)
+                    chunk = f.read()
+                complete = chunk[:chunk.rfind(b"\n") + 1]
+                seen = self._entries[-1]["seq"] if self._entries else -1
+                for line in complete.splitlines():
+                    entry = json.loads(line)
+                    if entry["seq"] > seen:
+                        self._entries.append(entry)
+                self._log_offset += len(complete)
+            return self._entries
+
+    def timestamps(self):
+        return [e["ts"] for e in self.entries()]
+
+    def _read(self, name):
+        if name in self._frames:
+            self._frames.move_to_end(name)
+            return self._frames[name]
+        df = feather.read_table(self.root / name, memory_map=True).to_pandas()
+        self._frames[name] = df
+        if len(self._frames) > 4 * self.keyframe_every:
+            self._frames.popitem(last=False)
+        return df
+
+    def _write_entry(self, kind, df, ts):
+        entries = self.entries()
+        seq = entries[-1]["seq"] + 1 if entries else 0
+        name = f"{seq:08d}.{kind}.feather"
+        tmp = self.root / (name + ".tmp")
+        feather.write_feather(df.reset_index(drop=True), tmp, compression="uncompressed")
+        os.replace(tmp, self.root / name)
+        entry = {"seq": seq, "ts": ts, "kind": kind, "file": name, "rows": len(df)}
+        line = (json.dumps(entry) + "\n").encode()
+        with open(self.log_path, "ab") as f:
+            f.write(line)
+        entries.append(entry)
+        self._log_offset += len(line)
+        return entry
+
+    def append(self, df, ts=None):
+        """Record a new snapshot of the sheet; returns the log entry (or None if unchanged)."""
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            party_cols = _party_cols(df)
+            ids = pd.Index(df[ID_COL].astype(str))
+            votes = _votes(df, party_cols)
+            if self._last is None and self.entries():
+                base, last_cols, last_votes = self._state(len(self.entries()) - 1)
+                self._last = (pd.Index(base[ID_COL].astype(str)), last_cols, last_votes)
+
+            entries = self.entries()
+            since_key = len(entries) - 1 - max((i for i, e in enumerate(entries) if e["kind"] == "key"), default=-1)
+            last = self._last
+            if last is None or last[1] != party_cols or not ids.equals(last[0]) or since_key >= self.keyframe_every:
+                entry = self._write_entry("key", df, ts)
+            else:
+                changed = np.flatnonzero((votes != last[2]).any(axis=1))
+                if len(changed) == 0:
+                    return None
+                delta = pd.DataFrame(votes[changed], columns=party_cols)
+                delta.insert(0, ID_COL, ids[changed])
+                entry = self._write_entry("delta", delta, ts)
+            self._last = (ids, party_cols, votes)
+            return entry
+
+    def _keyframe(self, name):
+        """``(base, ids, party_cols, votes)`` of a keyframe, parsed once."""
+        cache_key = ("parsed", name)
+        if cache_key not in self._frames:
+            base = self._read(name)
+            party_cols = _party_cols(base)
+            self._frames[cache_key] = (base, pd.Index(base[ID_COL].astype(str)), party_cols, _votes(base, party_cols))
+        self._frames.move_to_end(cache_key)
+        return self._frames[cache_key]
+
+    def _delta(self, name, ids, party_cols):
+        """``(row positions, votes)`` of a delta against its keyframe, parsed once."""
+        cache_key = ("parsed", name)
+        if cache_key not in self._frames:
+            delta = self._read(name)
+            self._frames[cache_key] = (ids.get_indexer(delta[ID_COL]), delta[party_cols].to_numpy(dtype=float))
+        self._frames.move_to_end(cache_key)
+        return self._frames[cache_key]
+
+    def _state(self, position):
+        """``(base, party_cols, votes)`` as of log entry ``position``."""
+        entries = self.entries()
+        key = max(i for i in range(position + 1) if entries[i]["kind"] == "key")
+        base, ids, party_cols, votes = self._keyframe(entries[key]["file"])
+        votes = votes.copy()
+        for entry in entries[key + 1:position + 1]:
+            rows, values = self._delta(entry["file"], ids, party_cols)
+            votes[rows] = values
+        return base, party_cols, votes
+
+    def frame(self, position):
+        """The full sheet as of log entry ``position``, with numeric party columns."""
+        with self._lock:
+            base, party_cols, votes = self._state(position)
+        state = base.copy()
+        state[party_cols] = votes
+        return state
+
+    def at(self, ts):
+        """``(base, party_cols, votes)`` as they stood at ``ts`` (None before the first entry)."""
+        with self._lock:
+            position = bisect_right(self.timestamps(), ts) - 1
+            if position < 0:
+                return None
+            return self._state(position)
+
+
+def _with_winners(base, party_cols, votes):
+    """Same columns as ``process_sheet`` output, built from an already numeric matrix."""
+    meta = base.drop(columns=party_cols)
+    df = pd.concat([meta, pd.DataFrame(votes, columns=party_cols, index=meta.index)], axis=1)[list(base.columns)]
+    df['District_Winner'] = district_winners(votes, party_cols)
+    df['Winning_Votes'] = votes.max(axis=1) if party_cols else 0.0
+    return df, party_cols
+
+
+@dataclass(frozen=True)
+class ReplayState:
+    timestamp: float
+    province_df: pd.DataFrame
+    partylist_df: pd.DataFrame
+    party_cols: list
+    summary: pd.DataFrame
+    pl_calc: pd.DataFrame
+
+
+class History:
+    """Snapshot history for every sheet, stored under ``root/<sheet>/``."""
+
+    def __init__(self, root, keyframe_every=KEYFRAME_EVERY):
+        self.root = Path(root)
+        self.keyframe_every = keyframe_every
+        self._sheets = {}
+        self._lock = threading.Lock()
+
+    def sheet(self, sheet):
+        with self._lock:
+            if sheet not in self._sheets:
+                self._sheets[sheet] = SheetHistory(self.root / sheet.replace(" ", "_"), self.keyframe_every)
+            return self._sheets[sheet]
+
+    def record(self, sheet, df, manifest_entry=None):
+        """``SheetPoller.on_snapshot`` hook: append ``df`` at its fetch time.
+
+        Sheets without a ``Constituency_ID`` column (e.g. Coordinates) are not kept.
+        """
+        if ID_COL not in df.columns:
+            return None
+        ts = manifest_entry.get("fetched_at") if manifest_entry else None
+        return self.sheet(sheet).append(df, ts=ts)
+
+    def timestamps(self, sheets=("Province", "Party List")):
+        """Distinct whole seconds at which any of ``sheets`` changed.
+
+        Rounded up, so replaying one of them includes every sheet fetched in
+        the same poll.
+        """
+        return sorted({math.ceil(ts) for s in sheets for ts in self.sheet(s).timestamps()})
+
+    def replay(self, ts):
+        """Winners, ``summary`` and ``pl_calc`` as they stood at ``ts``."""
+        province = self.sheet("Province").at(ts)
+        partylist = self.sheet("Party List").at(ts)
+        if province is None or partylist is None:
+            return None
+        province_df, _ = _with_winners(*province)
+        partylist_df, party_cols = _with_winners(*partylist)
+        pl_calc = party_list_table(pd.Series(partylist[2].sum(axis=0), index=party_cols))
+        summary = seat_summary(province_df['District_Winner'].value_counts(), pl_calc)
+        return ReplayState(ts, province_df, partylist_df, party_cols, summary, pl_calc)
+
+
+_default = None
+
+
+def default_history():
+    """History stored next to the live snapshots (``<store>/history``)."""
+    global _default
+    if _default is None:
+        from thai_election.ingest import STORE_DIR
+
+        _default = History(STORE_DIR / "history")
+    return _default
@@ -0,0 +1,254 @@
+"""Incremental results: only constituencies whose votes changed are recomputed.
+
+``ResultEngine.update`` diffs a new Province / Party List snapshot against the
+previous one by ``Constituency_ID``. Winners, seat counts, party-list vote
+totals and the Region x Province rollup cube are adjusted for the changed rows
+only. Each update publishes one immutable ``EngineResult`` whose ``changes``
+say what moved ("district X flipped from A to B").
+"""
+import threading
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from thai_election.rollup import RollupCube
+from thai_election.results import district_winners, party_list_table, seat_summary
+
+
+@dataclass(frozen=True)
+class Flip:
+    constituency_id: str
+    before: str
+    after: str
+
+    def __str__(self):
+        return f"{self.constituency_id} flipped from {self.before} to {self.after}"
+
+
+@dataclass
+class ChangeSet:
+    changed: list = field(default_factory=list)
+    added: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    flips: list = field(default_factory=list)
+    party_list_changed: bool = False
+    full_rebuild: bool = False
+
+    def __bool__(self):
+        return bool(self.changed or self.added or self.removed or self.party_list_changed or self.full_rebuild)
+
+    def messages(self):
+        return [str(flip) for flip in self.flips]
+
+
+@dataclass(frozen=True)
+class EngineResult:
+    """One consistent set of results, published as a whole after each update.
+
+    The frames, series and rollup cube are never modified after publishing;
+    readers take ``engine.result`` (or the return value of ``update``) once
+    and use only that object, so a concurrent update can't mix old and new
+    tables.
+    """
+    winners: pd.Series
+    winning_votes: pd.Series
+    list_totals: pd.Series
+    constituency_seats: pd.Series
+    pl_calc: pd.DataFrame
+    summary: pd.DataFrame
+    cube: RollupCube
+    changes: ChangeSet
+
+
+class ResultEngine:
+    """Keeps winners, seat counts and party-list totals up to date across snapshots."""
+
+    def __init__(self, list_seats=100):
+        self.list_seats = list_seats
+        self._lock = threading.Lock()
+        self._sources = (None, None)
+        self.parties = []
+        self._ids = pd.Index([])
+        self._votes = np.empty((0, 0))
+        self._list_ids = pd.Index([])
+        self._list_votes = np.empty((0, 0))
+        self._winners = pd.Series(dtype=object)
+        self._winning_votes = pd.Series(dtype=float)
+        self._list_totals = pd.Series(dtype=float)
+        self._constituency_seats = pd.Series(dtype=int)
+        self._pl_calc = party_list_table(self._list_totals, self.list_seats)
+        self._summary = seat_summary(self._constituency_seats, self._pl_calc)
+        self._cube = RollupCube(self.parties)
+        self._counts = {}
+        self._group_codes = np.empty(0, dtype=np.intp)
+        self._labels = (np.empty(0, dtype=object), np.empty(0, dtype=object))
+        self.result = self._publish(ChangeSet())
+
+    @staticmethod
+    def _matrix(df, parties):
+        ids = pd.Index(df['Constituency_ID'].astype(str))
+        return ids, df[parties].to_numpy(dtype=float)
+
+    @staticmethod
+    def _groups(df):
+        """Region and province label of every row (blank where the sheet has none)."""
+        return tuple(
+            df[col].fillna("").to_numpy(dtype=object) if col in df else np.full(len(df), "", dtype=object)
+            for col in ("Region", "Province (English)")
+        )
+
+    def _publish(self, changes):
+        return EngineResult(
+            winners=self._winners,
+            winning_votes=self._winning_votes,
+            list_totals=self._list_totals,
+            constituency_seats=self._constituency_seats,
+            pl_calc=self._pl_calc,
+            summary=self._summary,
+            cube=self._cube,
+            changes=changes,
+        )
+
+    def update(self, province_df, partylist_df, party_cols):
+        """Apply a new snapshot and return the published ``EngineResult``.
+
+        ``result.changes`` is the ``ChangeSet`` relative to the previous
+        snapshot (empty when this exact snapshot was already applied).
+        """
+        with self._lock:
+            if self._sources[0] is province_df and self._sources[1] is partylist_df:
+                return self.result
+            party_cols = list(party_cols)
+            ids, votes = self._matrix(province_df, party_cols)
+            list_ids, list_votes = self._matrix(partylist_df, party_cols)
+            groups = self._groups(province_df)
+
+            if party_cols != self.parties or not (ids.is_unique and list_ids.is_unique):
+                changes = self._rebuild(party_cols, ids, votes, list_ids, list_votes, groups)
+            else:
+                changes = self._apply(ids, votes, list_ids, list_votes, groups)
+
+            if changes.party_list_changed or changes.full_rebuild:
+                self._pl_calc = party_list_table(self._list_totals, self.list_seats)
+            if changes:
+                counts = pd.Series(self._counts, dtype=int)
+                self._constituency_seats = counts[counts > 0].sort_values(ascending=False, kind="stable")
+                self._summary = seat_summary(self._constituency_seats, self._pl_calc)
+            self._sources = (province_df, partylist_df)
+            # A single attribute swap: readers see either the old or the new result
+            self.result = self._publish(changes)
+            return self.result
+
+    def _rebuild(self, parties, ids, votes, list_ids, list_votes, groups):
+        self.parties = parties
+        self._ids, self._votes = ids, votes
+        self._list_ids, self._list_votes = list_ids, list_votes
+        winners = district_winners(votes, parties)
+        self._winners = pd.Series(winners, index=ids, dtype=object)
+        self._winning_votes = pd.Series(votes.max(axis=1) if parties else 0.0, index=ids)
+        self._list_totals = pd.Series(list_votes.sum(axis=0), index=parties)
+        self._counts = pd.Series(winners).value_counts(sort=False).to_dict()
+        self._cube = RollupCube(parties)
+        self._group_codes = self._cube.group_codes(*groups)
+        self._labels = groups
+        self._cube.add(self._group_codes, votes, winners)
+        return ChangeSet(changed=list(ids), full_rebuild=True, party_list_changed=True)
+
+    def _diff(self, old_ids, old_votes, ids, votes):
+        """Positions (in the new snapshot) of changed rows, plus added/removed ids."""
+        if ids.equals(old_ids):
+            changed = np.flatnonzero((votes != old_votes).any(axis=1))
+            return changed, [], []
+        pos = old_ids.get_indexer(ids)
+        known = pos >= 0
+        changed = np.flatnonzero(known)[(votes[known] != old_votes[pos[known]]).any(axis=1)]
+        added = list(ids[~known])
+        removed = list(old_ids.difference(ids))
+        return changed, added, removed
+
+    def _relabelled(self, ids, groups):
+        """Positions (in the new snapshot) of known rows whose region or province label changed."""
+        pos = self._ids.get_indexer(ids)
+        known = np.flatnonzero(pos >= 0)
+        old = pos[known]
+        moved = (groups[0][known] != self._labels[0][old]) | (groups[1][known] != self._labels[1][old])
+        return known[moved]
+
+    def _apply(self, ids, votes, list_ids, list_votes, groups):
+        changes = ChangeSet()
+
+        # Constituency votes and labels -> winners, seat counts and the rollup cube
+        changed, added, removed = self._diff(self._ids, self._votes, ids, votes)
+        relabelled = self._relabelled(ids, groups)
+        cube = self._cube
+        if len(changed) or len(relabelled) or added or removed:
+            # The published cube is left alone; readers may still hold it
+            cube = cube.copy()
+        if not ids.equals(self._ids):
+            # Added, removed or reordered rows: realign per-row state with the new order
+            winners = self._winners.reindex(ids)
+            best = self._winning_votes.reindex(ids)
+            for cid in removed:
+                old = self._winners[cid]
+                self._counts[old] -= 1
+            gone = self._ids.get_indexer(removed)
+            cube.add(self._group_codes[gone], self._votes[gone], self._winners.iloc[gone].to_numpy(), sign=-1)
+            # Added rows get their group code below, with the other touched rows
+            group_codes = self._group_codes[self._ids.get_indexer(ids)]
+            touched = np.union1d(np.union1d(changed, relabelled), np.flatnonzero(ids.isin(added)))
+        else:
+            winners = self._winners.copy()
+            best = self._winning_votes.copy()
+            group_codes = self._group_codes.copy()
+            touched = np.union1d(changed, relabelled)
+        if len(touched):
+            old_pos = self._ids.get_indexer(ids[touched])
+            known = old_pos >= 0
+            old_pos = old_pos[known]
+            cube.add(self._group_codes[old_pos], self._votes[old_pos],
+                     self._winners.iloc[old_pos].to_numpy(), sign=-1)
+            new_winners = district_winners(votes[touched], self.parties)
+            for cid, new in zip(ids[touched], new_winners):
+                old = self._winners.get(cid)
+                if old is not None:
+                    self._counts[old] -= 1
+                    if old != new:
+                        changes.flips.append(Flip(cid, old, new))
+                self._counts[new] = self._counts.get(new, 0) + 1
+            winners.iloc[touched] = new_winners
+            best.iloc[touched] = votes[touched].max(axis=1)
+            group_codes[touched] = cube.group_codes(groups[0][touched], groups[1][touched])
+            cube.add(group_codes[touched], votes[touched], new_winners)
+        self._winners, self._winning_votes = winners, best
+        self._ids, self._votes = ids, votes
+        self._group_codes, self._labels, self._cube = group_codes, groups, cube
+        changes.changed = list(ids[changed])
+        changes.added, changes.removed = added, removed
+
+        # Party-list votes -> running national totals
+        changed, added, removed = self._diff(self._list_ids, self._list_votes, list_ids, list_votes)
+        if len(changed) or added or removed:
+            totals = self._list_totals.to_numpy().copy()
+            old_pos = self._list_ids.get_indexer(list_ids[changed])
+            totals += list_votes[changed].sum(axis=0) - self._list_votes[old_pos].sum(axis=0)
+            if added:
+                totals += list_votes[list_ids.isin(added)].sum(axis=0)
+            if removed:
+                totals -= self._list_votes[self._list_ids.isin(removed)].sum(axis=0)
+            self._list_totals = pd.Series(totals, index=self.parties)
+            changes.party_list_changed = True
+        self._list_ids, self._list_votes = list_ids, list_votes
+        return changes
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def shared_engine(name):
+    """Process-wide engine for ``name`` (e.g. "live"), shared by every session."""
+    with _engines_lock:
+        if name not in _engines:
+            _engines[name] = ResultEngine()
+        return _engines[name]
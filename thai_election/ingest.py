@@ -0,0 +1,305 @@
+"""Background ingestion of the live Google Sheet into a local snapshot store.
+
+One asyncio poller per process (or one standalone process for the whole
+deployment) fetches the sheets concurrently, using ETag / Last-Modified
+conditional requests and exponential backoff on errors. Every validated
+download is written atomically to a ``SnapshotStore`` and appended to the
+snapshot history (see ``thai_election.history``); the pages then read
+the latest snapshot from disk instead of hitting Google once per session.
+
+Run standalone with::
+
+    python -m thai_election.ingest --interval 30
+
+Set ``THAI_ELECTION_SHEET_URL`` (a template containing ``{gid}``) to point
+the poller at a local stand-in that serves CSV fixtures.
+"""
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from thai_election.history import History, default_history
+from thai_election.loader import ROOT, SHEETS, party_columns, sheet_url
+
+STORE_DIR = Path(os.environ.get("THAI_ELECTION_STORE", ROOT / ".snapshots"))
+DEFAULT_INTERVAL = float(os.environ.get("THAI_ELECTION_POLL_INTERVAL", "30"))
+MAX_BACKOFF = 600.0
+# Columns a sheet must have before its snapshot replaces the previous one.
+REQUIRED_COLUMNS = {
+    "Province": ["Constituency_ID", "Province (English)", "District"],
+    "Party List": ["Constituency_ID"],
+    "Coordinates": ["Province (English)", "Latitude", "Longitude"],
+}
+# Sheets holding one vote column per party.
+VOTE_SHEETS = ("Province", "Party List")
+# A sheet's party columns must match those of the latest stored snapshot of another.
+PARTIES_FROM = {"Party List": "Province"}
+
+log = logging.getLogger(__name__)
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def validate(sheet, body, parties=None):
+    """Parse ``body`` as the CSV export of ``sheet`` and check it looks sane.
+
+    Vote sheets need at least one party column, every filled cell must be
+    a number, and if ``parties`` is given the party columns must be exactly
+    those parties.
+    """
+    _, header = SHEETS[sheet]
+    try:
+        df = pd.read_csv(io.BytesIO(body), header=header)
+    except Exception as exc:
+        raise SnapshotError(f"{sheet}: not a CSV export ({exc})") from exc
+    missing = [c for c in REQUIRED_COLUMNS.get(sheet, []) if c not in df.columns]
+    if missing:
+        raise SnapshotError(f"{sheet}: missing columns {missing}")
+    if df.empty:
+        raise SnapshotError(f"{sheet}: no rows")
+    if sheet in VOTE_SHEETS:
+        check_party_columns(sheet, df, parties)
+    return df
+
+
+def check_party_columns(sheet, df, parties=None):
+    found = party_columns(df.columns)
+    if not found:
+        raise SnapshotError(f"{sheet}: no party columns")
+    values = df[found]
+    filled = values.notna() & (values.astype(str).apply(lambda col: col.str.strip()) != "")
+    numeric = values.apply(pd.to_numeric, errors="coerce").notna()
+    bad = [c for c in found if (filled[c] & ~numeric[c]).any()]
+    if bad:
+        raise SnapshotError(f"{sheet}: non-numeric votes in {bad}")
+    if parties is not None:
+        missing = [c for c in parties if c not in found]
+        extra = [c for c in found if c not in parties]
+        if missing or extra:
+            raise SnapshotError(f"{sheet}: party columns differ from the stored sheet "
+                                f"(missing {missing}, unexpected {extra})")
+
+
+class SnapshotStore:
+    """Directory holding the latest validated CSV of each sheet plus a manifest."""
+
+    def __init__(self, root=STORE_DIR):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    @property
+    def manifest_path(self):
+        return self.root / "manifest.json"
+
+    def manifest(self):
+        try:
+            return json.loads(self.manifest_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def entry(self, sheet):
+        return self.manifest().get(sheet)
+
+    def version(self, sheet):
+        entry = self.entry(sheet)
+        return None if entry is None else entry["version"]
+
+    def path(self, sheet):
+        entry = self.entry(sheet)
+        if entry is None:
+            return None
+        path = self.root / entry["file"]
+        return path if path.exists() else None
+
+    def write(self, sheet, body, etag=None, last_modified=None):
+        """Store ``body`` as the newest snapshot of ``sheet``; return its manifest entry."""
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            manifest = self.manifest()
+            previous = manifest.get(sheet, {})
+            version = previous.get("version", 0) + 1
+            name = f"{sheet.replace(' ', '_')}.{version}.csv"
+            tmp = self.root / (name + ".tmp")
+            tmp.write_bytes(body)
+            os.replace(tmp, self.root / name)
+            manifest[sheet] = {
+                "version": version,
+                "file": name,
+                "fetched_at": time.time(),
+                "sha256": hashlib.sha256(body).hexdigest(),
+                "etag": etag,
+                "last_modified": last_modified,
+            }
+            tmp = self.manifest_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(manifest, indent=2))
+            os.replace(tmp, self.manifest_path)
+            # Readers hold the old file name for at most one read; keep one spare.
+            if previous.get("file"):
+                stale = self.root / f"{sheet.replace(' ', '_')}.{version - 2}.csv"
+                stale.unlink(missing_ok=True)
+            return manifest[sheet]
+
+
+@dataclass
+class FetchResult:
+    sheet: str
+    status: str  # "updated", "unchanged" or "error"
+    detail: str = ""
+
+
+class SheetPoller:
+    """Fetches ``sheets`` concurrently every ``interval`` seconds into ``store``."""
+
+    def __init__(self, store=None, sheets=tuple(SHEETS), interval=DEFAULT_INTERVAL,
+                 url_for=None, timeout=20.0, max_backoff=MAX_BACKOFF, on_snapshot=None):
+        self.store = store or SnapshotStore()
+        self.sheets = tuple(sheets)
+        self.interval = interval
+        self.url_for = url_for or (lambda sheet: sheet_url(SHEETS[sheet][0]))
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self.on_snapshot = on_snapshot
+        self._failures = {sheet: 0 for sheet in self.sheets}
+        self._next_due = {sheet: 0.0 for sheet in self.sheets}
+
+    def _stored_parties(self, sheet):
+        """Party columns of the latest stored snapshot of ``sheet``, or ``None``."""
+        path = self.store.path(sheet)
+        if path is None:
+            return None
+        return party_columns(pd.read_csv(path, header=SHEETS[sheet][1], nrows=0).columns)
+
+    def _fetch(self, sheet):
+        """Blocking conditional GET for one sheet; runs in a worker thread."""
+        entry = self.store.entry(sheet) or {}
+        request = urllib.request.Request(self.url_for(sheet))
+        if entry.get("etag"):
+            request.add_header("If-None-Match", entry["etag"])
+        if entry.get("last_modified"):
+            request.add_header("If-Modified-Since", entry["last_modified"])
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read()
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+        except urllib.error.HTTPError as exc:
+            if exc.code == 304:
+                return FetchResult(sheet, "unchanged", "304 Not Modified")
+            raise
+
+        if hashlib.sha256(body).hexdigest() == entry.get("sha256"):
+            return FetchResult(sheet, "unchanged", "same content")
+        reference = PARTIES_FROM.get(sheet)
+        df = validate(sheet, body, self._stored_parties(reference) if reference else None)
+        written = self.store.write(sheet, body, etag=etag, last_modified=last_modified)
+        if self.on_snapshot is not None:
+            try:
+                self.on_snapshot(sheet, df, written)
+            except Exception:
+                log.exception("on_snapshot hook failed for %s", sheet)
+        return FetchResult(sheet, "updated", f"version {written['version']}")
+
+    async def _poll_sheet(self, sheet):
+        try:
+            result = await asyncio.to_thread(self._fetch, sheet)
+        except Exception as exc:
+            self._failures[sheet] += 1
+            delay = min(self.max_backoff, self.interval * 2 ** self._failures[sheet])
+            delay *= random.uniform(0.8, 1.2)
+            self._next_due[sheet] = time.monotonic() + delay
+            log.warning("Fetching %s failed (%s); retrying in %.0fs", sheet, exc, delay)
+            return FetchResult(sheet, "error", str(exc))
+        self._failures[sheet] = 0
+        self._next_due[sheet] = time.monotonic() + self.interval
+        log.info("%s: %s %s", sheet, result.status, result.detail)
+        return result
+
+    async def poll_once(self, force=False):
+        """Fetch every sheet that is due (or all of them with ``force``) concurrently."""
+        now = time.monotonic()
+        due = [s for s in self.sheets if force or self._next_due[s] <= now]
+        # Sheets checked against another due sheet wait for its new snapshot
+        later = [s for s in due if PARTIES_FROM.get(s) in due]
+        results = await asyncio.gather(*(self._poll_sheet(s) for s in due if s not in later))
+        results += await asyncio.gather(*(self._poll_sheet(s) for s in later))
+        return results
+
+    async def run(self, stop=None):
+        """Poll until ``stop`` (an ``asyncio.Event``) is set."""
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            await self.poll_once()
+            wake = min(self._next_due.values()) - time.monotonic()
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=max(wake, 0.1))
+            except asyncio.TimeoutError:
+                pass
+
+
+_store = None
+_poller_thread = None
+_poller_lock = threading.Lock()
+
+
+def default_store():
+    global _store
+    if _store is None:
+        _store = SnapshotStore()
+    return _store
+
+
+def ensure_background_poller(**kwargs):
+    """Start the process-wide poller in a daemon thread (once) and return the thread."""
+    global _poller_thread
+    with _poller_lock:
+        if _poller_thread is None or not _poller_thread.is_alive():
+            kwargs.setdefault("on_snapshot", default_history().record)
+            poller = SheetPoller(store=default_store(), **kwargs)
+            _poller_thread = threading.Thread(
+                target=lambda: asyncio.run(poller.run()), name="sheet-poller", daemon=True
+            )
+            _poller_thread.start()
+        return _poller_thread
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Poll the live election sheet into a local snapshot store.")
+    parser.add_argument("--store", default=STORE_DIR, type=Path)
+    parser.add_argument("--interval", default=DEFAULT_INTERVAL, type=float, help="seconds between polls")
+    parser.add_argument("--sheet", action="append", choices=list(SHEETS), help="sheet to poll (repeatable)")
+    parser.add_argument("--once", action="store_true", help="fetch once and exit")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    poller = SheetPoller(
+        SnapshotStore(args.store),
+        sheets=args.sheet or tuple(SHEETS),
+        interval=args.interval,
+        on_snapshot=History(args.store / "history").record,
+    )
+    if args.once:
+        results = asyncio.run(poller.poll_once(force=True))
+        raise SystemExit(0 if all(r.status != "error" for r in results) else 1)
+    try:
+        asyncio.run(poller.run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
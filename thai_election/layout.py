@@ -0,0 +1,68 @@
+"""Deterministic clustering of district bubbles around their province centroid."""
+import numpy as np
+import pandas as pd
+
+from thai_election.cache import TTLCache, frame_digest
+
+LAYOUTS = ("grid", "hex", "spiral")
+GOLDEN_ANGLE = np.pi * (3 - np.sqrt(5))
+
+_cache = TTLCache()
+
+
+def _slots(rank, n, method):
+    """Unit-spaced (x, y) for slot ``rank`` of a cluster of ``n`` points."""
+    if method == "spiral":
+        # Vogel (sunflower) spiral: even density, neighbours about one unit apart.
+        r = 0.55 * np.sqrt(rank)
+        theta = rank * GOLDEN_ANGLE
+        return r * np.cos(theta), r * np.sin(theta)
+
+    size = np.ceil(np.sqrt(n))
+    # Left-to-right, top-to-bottom, centred on the centroid.
+    row = size - 1 - rank // size
+    col = rank % size
+    x = col - (size - 1) / 2.0
+    y = row - (size - 1) / 2.0
+    if method == "hex":
+        x = x + np.where(row % 2 == 1, 0.5, 0.0) - np.where(size > 1, 0.25, 0.0)
+        y = y * (np.sqrt(3) / 2)
+    return x, y
+
+
+def _compute_offsets(plot_df, spacing, method):
+    province = plot_df['Province (English)']
+    district = plot_df['District'].astype(int)
+    has_province = province.notna().to_numpy()
+
+    keys = pd.DataFrame({"province": province, "district": district})
+    keys = keys[has_province].sort_values(["province", "district"], kind="stable")
+    groups = keys.groupby("province", sort=False)
+    rank = groups.cumcount().to_numpy(dtype=float)
+    n = groups["district"].transform("size").to_numpy(dtype=float)
+    mean_lat = plot_df.loc[keys.index, 'Latitude'].groupby(keys["province"]).transform("mean").to_numpy()
+
+    # Scale longitude offsets by 1/cos(lat) to approximate equal physical spacing
+    lon_scale = 1.0 / np.maximum(np.cos(np.deg2rad(mean_lat)), 0.2)
+    x, y = _slots(rank, n, method)
+    single = n == 1  # single district: keep at centroid
+
+    offsets = pd.DataFrame(0.0, index=plot_df.index, columns=['dx', 'dy'])
+    pos = plot_df.index.get_indexer(keys.index)
+    offsets.iloc[pos, 0] = np.where(single, 0.0, x * spacing * lon_scale)
+    offsets.iloc[pos, 1] = np.where(single, 0.0, y * spacing)
+    return offsets
+
+
+def district_offsets(plot_df, spacing=0.13, method="grid"):
+    """``dx``/``dy`` degree offsets for every row of ``plot_df``.
+
+    ``plot_df`` needs ``Province (English)``, ``District``, ``Latitude`` and
+    ``Longitude``. Districts are placed in ``District`` order using ``method``
+    (one of ``LAYOUTS``). Results are cached on the content of those columns.
+    """
+    if method not in LAYOUTS:
+        raise ValueError(f"Unknown layout {method!r}; expected one of {LAYOUTS}")
+    cols = ['Province (English)', 'District', 'Latitude', 'Longitude']
+    key = (frame_digest(plot_df, cols), spacing, method)
+    return _cache.get_or_compute(key, lambda: _compute_offsets(plot_df[cols], spacing, method))
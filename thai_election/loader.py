@@ -0,0 +1,110 @@
+"""Loading of the election workbook / live Google Sheet, cached per process."""
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from thai_election.cache import TTLCache
+
+ROOT = Path(__file__).resolve().parent.parent
+WORKBOOK = ROOT / "Th election Province list.xlsx"
+
+SHEET_ID = "1fm_6pbiXU6jBwHtu13Yuqh_XgQY-AW03"
+# Sheet name in the workbook -> (gid in the live Google Sheet, header row)
+SHEETS = {
+    "Province": ("858321697", 1),
+    "Party List": ("374730466", 1),
+    "Coordinates": ("2069825376", 0),
+}
+NON_PARTY_COLS = ['Province', 'Region', 'Constituency_ID', 'Province (English)', 'District', "Coordinates"]
+NO_INFO = "NO INFORMATION YET"
+
+# Seconds a live download is reused before the sheet is fetched again.
+LIVE_TTL = float(os.environ.get("THAI_ELECTION_LIVE_TTL", "30"))
+
+_cache = TTLCache()
+
+
+# Export URL of a live sheet; override to point at a local stand-in.
+SHEET_URL = os.environ.get(
+    "THAI_ELECTION_SHEET_URL",
+    f"https://docs.google.com/spreadsheets/d/{SHEET_ID}/export?format=csv&gid={{gid}}",
+)
+
+
+def sheet_url(gid):
+    return SHEET_URL.format(gid=gid)
+
+
+def read_sheet(sheet, live=False):
+    """Read one sheet as a raw DataFrame, without any caching.
+
+    Live reads prefer the newest snapshot written by the ingestion poller and
+    only download from Google when no snapshot exists yet.
+    """
+    gid, header = SHEETS[sheet]
+    if live:
+        from thai_election.ingest import default_store
+
+        path = default_store().path(sheet)
+        return pd.read_csv(path if path is not None else sheet_url(gid), header=header)
+    from thai_election import snapshot
+
+    return snapshot.read_sheet(sheet)
+
+
+def party_columns(columns):
+    """The party vote columns among a sheet's ``columns``, in sheet order."""
+    return [c for c in columns if c not in NON_PARTY_COLS and "Unnamed" not in c]
+
+
+def process_sheet(df):
+    """Coerce party columns to numbers and add District_Winner / Winning_Votes."""
+    party_cols = party_columns(df.columns)
+    # Rebuild in one concat rather than one assignment per column, so wide
+    # sheets (many parties) don't end up as a fragmented frame.
+    numeric = df[party_cols].apply(pd.to_numeric, errors='coerce').fillna(0)
+    df = pd.concat([df.drop(columns=party_cols), numeric], axis=1)[list(df.columns)]
+    row_max = df[party_cols].max(axis=1)
+    row_idxmax = df[party_cols].idxmax(axis=1)
+
+    # Only assign a winner if the max vote is > 0; otherwise, leave blank
+    df['District_Winner'] = row_idxmax.where(row_max > 0, NO_INFO)
+    df['Winning_Votes'] = row_max
+    return df, party_cols
+
+
+def load_sheet(sheet, live=False, ttl=None):
+    """Return ``(df, party_cols)`` for ``sheet``, shared by every session.
+
+    Offline loads are kept until the workbook changes on disk; live loads are
+    re-read as soon as the poller stores a new snapshot, and at least every
+    ``ttl`` seconds (default ``LIVE_TTL``). The returned frame is shared, so
+    do not modify it in place.
+    """
+    if live:
+        from thai_election.ingest import default_store
+
+        key = ("live", sheet)
+        version = default_store().version(sheet)
+        ttl = LIVE_TTL if ttl is None else ttl
+    else:
+        key = ("xlsx", sheet)
+        version = WORKBOOK.stat().st_mtime_ns
+    return _cache.get_or_compute(
+        key, lambda: process_sheet(read_sheet(sheet, live)), ttl=ttl, version=version
+    )
+
+
+def load_election_data(live=False):
+    province_df, _ = load_sheet("Province", live)
+    partylist_df, party_cols = load_sheet("Party List", live)
+    return province_df, partylist_df, party_cols
+
+
+def invalidate(sheet=None, live=None):
+    """Drop cached sheets. ``sheet``/``live`` narrow what is dropped."""
+    source = None if live is None else ("live" if live else "xlsx")
+    _cache.invalidate(
+        lambda key: (source is None or key[0] == source) and (sheet is None or key[1] == sheet)
+    )
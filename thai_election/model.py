@@ -0,0 +1,172 @@
+"""Immutable per-snapshot data model shared by every session.
+
+A snapshot's two sheets are boiled down once to arrays: the float64 vote
+matrices (constituencies x parties) exactly as the sheets hold them,
+categorical province / region labels and the index of each
+constituency's winner. Everything derived from them (seat counts, vote
+totals, the map frame) is computed on first use and then shared, so
+pages read from the model instead of building their own merged or summed
+copies on every rerun.
+
+All arrays are read-only; treat the frames returned here the same way.
+"""
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from thai_election.cache import frame_digest
+from thai_election.layout import district_offsets
+from thai_election.loader import NO_INFO
+
+_lock = threading.Lock()
+_models = {}  # id(province_df) -> (weakref to province_df, {key: (weakref to partylist_df, ElectionModel)})
+
+
+def _frozen(array):
+    array.setflags(write=False)
+    return array
+
+
+def _votes(df, party_cols):
+    # The sheets carry fractional (scaled) counts; keep them as they are so
+    # totals and winners agree with the seat engine to the last digit
+    return _frozen(df[list(party_cols)].to_numpy(dtype=np.float64, copy=True))
+
+
+def _labels(df, column, categories=None):
+    # Region is optional in both vote sheets; rows then carry no label (code -1)
+    if column not in df:
+        return pd.Categorical.from_codes(np.full(len(df), -1), categories=[] if categories is None else categories)
+    return pd.Categorical(df[column], categories=categories)
+
+
+class ElectionModel:
+    """One snapshot's constituency and party-list votes as read-only arrays.
+
+    ``winner`` holds each constituency's index into ``parties`` (``-1`` when
+    no votes are in yet).
+    """
+
+    def __init__(self, province_df, partylist_df, party_cols):
+        self.parties = tuple(party_cols)
+        self.constituency_ids = pd.Index(province_df['Constituency_ID'].astype(str), name='Constituency_ID')
+        self.province = pd.Categorical(province_df['Province (English)'])
+        self.region = _labels(province_df, 'Region')
+        self.district = _frozen(pd.to_numeric(province_df['District'], errors='coerce').fillna(0).to_numpy(np.int16))
+
+        self.votes = _votes(province_df, party_cols)
+        best = self.votes.argmax(axis=1) if party_cols else np.zeros(len(self.votes), dtype=np.intp)
+        most = self.votes.max(axis=1, initial=0)
+        self.winner = _frozen(np.where(most > 0, best, -1).astype(np.int16))
+        self.winning_votes = _frozen(np.where(most > 0, most, 0.0))
+        self.list_votes = _votes(partylist_df, party_cols)
+        self.list_region = _labels(partylist_df, 'Region', self.region.categories)
+
+        self._derived = {}
+        self._derived_lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.constituency_ids)
+
+    def _derive(self, key, build):
+        with self._derived_lock:
+            value = self._derived.get(key)
+            if value is None:
+                value = self._derived[key] = build()
+            return value
+
+    @property
+    def winner_labels(self):
+        """Winning party per constituency as a categorical (``NO_INFO`` if none yet)."""
+        def build():
+            categories = list(self.parties) + [NO_INFO]
+            codes = np.where(self.winner < 0, len(self.parties), self.winner)
+            return pd.Categorical.from_codes(codes, categories=categories)
+        return self._derive("winner_labels", build)
+
+    @property
+    def seat_counts(self):
+        """Constituencies won per party (``NO_INFO`` included), largest first."""
+        def build():
+            counts = pd.Series(self.winner_labels).value_counts()
+            counts = counts[counts > 0].rename_axis("District_Winner").rename("count")
+            counts.index = counts.index.astype(object)
+            return counts
+        return self._derive("seat_counts", build)
+
+    @property
+    def constituency_totals(self):
+        """Constituency votes per party across the country."""
+        return self._derive(
+            "constituency_totals",
+            lambda: pd.Series(self.votes.sum(axis=0), index=list(self.parties)),
+        )
+
+    @property
+    def list_totals(self):
+        """Party-list votes per party across the country."""
+        return self._derive(
+            "list_totals",
+            lambda: pd.Series(self.list_votes.sum(axis=0), index=list(self.parties)),
+        )
+
+    def map_frame(self, coordinates_df, spacing=0.13, method="grid"):
+        """One row per constituency with its bubble position, shared per layout.
+
+        Replaces a per-session merge with the coordinates sheet: province
+        centroids are looked up through the categorical codes.
+        """
+        def build():
+            centroids = (coordinates_df[['Province (English)', 'Latitude', 'Longitude']]
+                         .drop_duplicates('Province (English)')
+                         .set_index('Province (English)'))
+            lookup = centroids.reindex(self.province.categories)
+            codes = self.province.codes
+            valid = codes >= 0
+            lat = np.where(valid, lookup['Latitude'].to_numpy(dtype=float)[codes], np.nan)
+            lon = np.where(valid, lookup['Longitude'].to_numpy(dtype=float)[codes], np.nan)
+            frame = pd.DataFrame({
+                'Constituency_ID': self.constituency_ids,
+                'Province (English)': self.province,
+                'District': self.district.astype(str),
+                'Latitude': lat,
+                'Longitude': lon,
+            })
+            offsets = district_offsets(
+                frame.assign(**{'Province (English)': frame['Province (English)'].astype(object),
+                                'District': self.district}),
+                spacing=spacing, method=method,
+            )
+            frame['Lat_Jitter'] = lat + offsets['dy'].to_numpy()
+            frame['Lon_Jitter'] = lon + offsets['dx'].to_numpy()
+            frame['District_Winner'] = self.winner_labels
+            frame['Winning_Votes'] = self.winning_votes
+            return frame
+        key = ("map_frame", frame_digest(coordinates_df, ['Province (English)', 'Latitude', 'Longitude']), spacing, method)
+        return self._derive(key, build)
+
+
+def _forget(frame_id):
+    with _lock:
+        _models.pop(frame_id, None)
+
+
+def election_model(province_df, partylist_df, party_cols):
+    """The model for this exact pair of snapshot frames, built on first use.
+
+    Like ``drilldown.constituency_index`` it lives as long as the shared
+    province frame it was built from.
+    """
+    key = (id(partylist_df), tuple(party_cols))
+    frame_id = id(province_df)
+    with _lock:
+        entry = _models.get(frame_id)
+        if entry is None or entry[0]() is not province_df:
+            entry = (weakref.ref(province_df, lambda _: _forget(frame_id)), {})
+            _models[frame_id] = entry
+        cached = entry[1].get(key)
+        if cached is None or cached[0]() is not partylist_df:
+            cached = entry[1][key] = (weakref.ref(partylist_df), ElectionModel(province_df, partylist_df, party_cols))
+        return cached[1]
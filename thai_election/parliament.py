@@ -0,0 +1,57 @@
+"""Hemicycle (arc) layout for the parliament chart."""
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+
+@lru_cache(maxsize=32)
+def seat_geometry(n_seats=500, rows=10, radius=10, row_step=0.7):
+    """Return read-only ``(x, y)`` arrays with the position of every seat.
+
+    Seats are laid out in order of increasing angle, cycling through ``rows``
+    concentric rows, so consecutive seats of a party form a wedge.
+    """
+    i = np.arange(n_seats)
+    angle = np.pi * (i / n_seats)
+    r = radius + (i % rows) * row_step
+    x = r * np.cos(np.pi - angle)
+    y = r * np.sin(np.pi - angle)
+    x.flags.writeable = False
+    y.flags.writeable = False
+    return x, y
+
+
+def create_parliament_data(summary_df, province_df, rows=10, radius=10, n_seats=500):
+    """One row per seat: ``x``, ``y``, ``Party`` and ``Location``.
+
+    Parties appear in ``summary_df`` order; each party's constituency seats
+    (in ``province_df`` order) come before its party-list seats.
+    """
+    parties = summary_df.index
+    winners = province_df['District_Winner']
+    party_rank = pd.Index(parties).get_indexer(winners)
+    won = party_rank >= 0
+    district_rank = party_rank[won]
+    district_info = (
+        province_df['Province (English)'].astype(str) + ", " + province_df['District'].astype(str)
+    ).to_numpy()[won]
+
+    pl_counts = summary_df["Party List"].to_numpy(dtype=np.int64)
+    pl_rank = np.repeat(np.arange(len(parties)), pl_counts)
+
+    # Constituency seats sort before list seats of the same party; the stable
+    # sort keeps province_df order within a party.
+    rank = np.concatenate([district_rank, pl_rank])
+    is_list = np.concatenate([np.zeros(len(district_rank), bool), np.ones(len(pl_rank), bool)])
+    order = np.lexsort((is_list, rank))
+    info = np.concatenate([district_info, np.full(len(pl_rank), "Party List", dtype=object)])[order]
+
+    n = len(order)
+    x, y = seat_geometry(max(n_seats, n), rows, radius)
+    return pd.DataFrame({
+        "x": x[:n],
+        "y": y[:n],
+        "Party": pd.Categorical.from_codes(rank[order], categories=parties),
+        "Location": info,
+    })
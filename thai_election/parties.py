@@ -0,0 +1,220 @@
+"""Party registry: codes, Thai / English names and colours, resolved by any name.
+
+The registry comes from the ECT party list saved by ``scrap_ect.ipynb``
+(``thai_political_parties.xlsx``, or the raw ``party-info`` HTML page) plus
+the workbook's "Party Color" sheet. Both are parsed once into a JSON index
+under the cache directory, keyed by the sources' SHA-256, so later loads
+skip Excel entirely.
+
+Names are normalised before lookup -- the "พรรค" prefix, a trailing
+"PARTY", case, spacing and apostrophes are ignored -- so a sheet header
+such as "พรรคเศรษฐกิจ", "เศรษฐกิจ" or "Economic Party" resolves to the same
+party with one dict lookup.
+
+Rebuild the index by hand with::
+
+    python -m thai_election.parties --force
+"""
+import argparse
+import json
+import os
+import re
+import threading
+import unicodedata
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from thai_election.cache import TTLCache
+from thai_election.loader import NO_INFO, ROOT, WORKBOOK
+from thai_election.snapshot import CACHE_DIR, file_sha256
+
+REGISTRY = Path(os.environ.get("THAI_ELECTION_PARTY_REGISTRY", ROOT / "thai_political_parties.xlsx"))
+COLOR_SHEET = "Party Color"
+DEFAULT_COLOR = "#808080"
+INDEX_FILE = "parties.json"
+INDEX_FORMAT = 1  # bump when the parsing or merge rules change
+
+_PREFIX = "พรรค"
+_DROP = re.compile(r"[\s'‘’`\"“”.\-]+")
+_cache = TTLCache()
+_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Party:
+    code: str  # ECT party code; "" for pseudo-parties such as NO_INFO
+    thai_name: str
+    english_name: str
+    color: str = None
+
+
+def normalize(name):
+    """Lookup key for a party name in either language."""
+    # Quotes and spaces go first so a quoted or spaced "พรรค" prefix is still seen
+    key = _DROP.sub("", unicodedata.normalize("NFC", str(name)).casefold())
+    if key.startswith(_PREFIX) and len(key) > len(_PREFIX):
+        key = key[len(_PREFIX):]
+    if key.isdigit():
+        return key.lstrip("0") or key
+    if key.endswith("party") and len(key) > len("party"):
+        key = key[:-len("party")]
+    return key
+
+
+def parse_registry_html(html):
+    """Parties embedded in the ECT ``party-info`` page as ``code``/``name_th``/``name_en`` records."""
+    # The records sit inside a JS string, so their quotes may be backslash-escaped
+    q = r'\\?"'
+    pattern = re.compile(
+        rf'{q}code{q}\s*:\s*{q}(?P<code>.*?){q}.*?'
+        rf'{q}name_th{q}\s*:\s*{q}(?P<th>.*?){q}.*?'
+        rf'{q}name_en{q}\s*:\s*{q}(?P<en>.*?){q}',
+        re.DOTALL,
+    )
+    return pd.DataFrame(
+        [{"Party Code": m["code"], "Thai Name": m["th"], "English Name": m["en"].replace("\\'", "'")}
+         for m in pattern.finditer(html)],
+        columns=["Party Code", "Thai Name", "English Name"],
+    )
+
+
+def read_registry(path=REGISTRY):
+    """The saved registry as ``Party Code`` / ``Thai Name`` / ``English Name``."""
+    path = Path(path)
+    if path.suffix.lower() in (".html", ".htm"):
+        return parse_registry_html(path.read_text(encoding="utf-8"))
+    return pd.read_excel(path, dtype={"Party Code": str})
+
+
+def read_colors(workbook=WORKBOOK):
+    """The workbook's "Party Color" sheet: code, English name, Thai name, colour."""
+    df = pd.read_excel(workbook, sheet_name=COLOR_SHEET, header=None, skiprows=1,
+                       names=["code", "english", "thai", "color"], dtype=str)
+    return df.dropna(subset=["english", "thai"], how="all")
+
+
+def _clean(value):
+    return "" if pd.isna(value) else str(value).strip()
+
+
+def _code(value):
+    # The registry stores "034", the colour sheet 34 (read back as "34" or "34.0")
+    value = _clean(value)
+    if value.endswith(".0"):
+        value = value[:-2]
+    return value.lstrip("0") or value if value.isdigit() else value
+
+
+def build_parties(registry, colors):
+    """Merge registry rows and colour rows into ``Party`` records (colour sheet wins on names)."""
+    parties = {}
+    for row in registry.itertuples(index=False):
+        code = _code(row[0])
+        parties[code or normalize(row[1])] = Party(code, _clean(row[1]), _clean(row[2]))
+    for row in colors.itertuples(index=False):
+        code = _code(row.code)
+        key = code or normalize(row.thai or row.english)
+        known = parties.get(key)
+        parties[key] = Party(
+            code,
+            _clean(row.thai) or (known.thai_name if known else ""),
+            _clean(row.english) or (known.english_name if known else ""),
+            _clean(row.color) or None,
+        )
+    return list(parties.values())
+
+
+class PartyIndex:
+    """O(1) name -> ``Party`` resolution over every known spelling."""
+
+    def __init__(self, parties):
+        self.parties = list(parties)
+        self._by_name = {}
+        for party in self.parties:
+            for name in (party.thai_name, party.english_name, party.code):
+                if name:
+                    self._by_name.setdefault(normalize(name), party)
+
+    def __len__(self):
+        return len(self.parties)
+
+    def resolve(self, name):
+        """The ``Party`` called ``name`` in any spelling, or ``None``."""
+        return self._by_name.get(normalize(name))
+
+    def code(self, name):
+        party = self.resolve(name)
+        return party.code if party else None
+
+    def english(self, name):
+        """English label, falling back to ``name`` itself."""
+        party = self.resolve(name)
+        return party.english_name if party and party.english_name else name
+
+    def color(self, name, default=DEFAULT_COLOR):
+        party = self.resolve(name)
+        return party.color if party and party.color else default
+
+    def colors(self, names, default=DEFAULT_COLOR):
+        """``{name: colour}`` for a plotly ``color_discrete_map``, keyed by the names as given."""
+        return {name: self.color(name, default) for name in names}
+
+
+def _sources(registry, workbook):
+    return {"format": INDEX_FORMAT, "registry": file_sha256(registry), "workbook": file_sha256(workbook)}
+
+
+def build_index(registry=REGISTRY, workbook=WORKBOOK, cache_dir=CACHE_DIR, force=False):
+    """Write the JSON index if it is missing or stale; return its path."""
+    path = Path(cache_dir) / INDEX_FILE
+    with _lock:
+        sources = _sources(registry, workbook)
+        if not force:
+            try:
+                if json.loads(path.read_text())["sources"] == sources:
+                    return path
+            except (OSError, ValueError, KeyError):
+                pass
+        parties = build_parties(read_registry(registry), read_colors(workbook))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"sources": sources, "parties": [asdict(p) for p in parties]}
+        tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False, indent=1))
+        os.replace(tmp, path)
+        return path
+
+
+def load_index(registry=REGISTRY, workbook=WORKBOOK, cache_dir=CACHE_DIR):
+    path = build_index(registry, workbook, cache_dir)
+    parties = [Party(**p) for p in json.loads(path.read_text())["parties"]]
+    if not any(normalize(p.thai_name) == normalize(NO_INFO) for p in parties):
+        parties.append(Party("", NO_INFO, NO_INFO, "#D3D3D3"))
+    return PartyIndex(parties)
+
+
+def party_index(registry=REGISTRY, workbook=WORKBOOK, cache_dir=CACHE_DIR):
+    """Process-wide ``PartyIndex``, reloaded only when a source file changes."""
+    registry, workbook = Path(registry), Path(workbook)
+    version = (registry.stat().st_mtime_ns, workbook.stat().st_mtime_ns)
+    return _cache.get_or_compute(
+        ("parties", str(registry), str(workbook), str(cache_dir)),
+        lambda: load_index(registry, workbook, cache_dir),
+        version=version,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the cached party name index.")
+    parser.add_argument("--registry", default=REGISTRY, type=Path, help="saved registry (.xlsx) or party-info page (.html)")
+    parser.add_argument("--workbook", default=WORKBOOK, type=Path)
+    parser.add_argument("--cache-dir", default=CACHE_DIR, type=Path)
+    parser.add_argument("--force", action="store_true", help="rebuild even if the index looks current")
+    args = parser.parse_args(argv)
+    path = build_index(args.registry, args.workbook, args.cache_dir, force=args.force)
+    print(f"Party index ready in {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Lightweight timing spans for the dashboard's hot paths.
+
+Wrap a stage in ``with span("parliament/seat_math"):`` (or keep the
+``span(...)`` and call ``.end()`` for spans that cover a whole script).
+Durations go into a rolling per-process store, are logged as one JSON
+object per span on the ``thai_election.perf`` logger (written to
+``THAI_ELECTION_PERF_LOG`` if set), and are summarised (p50/p95 per stage)
+in a sidebar panel that only appears with ``?perf=1`` in the URL.
+
+Memory sampling (``tracemalloc``) is off by default; enable it with
+``THAI_ELECTION_PROFILE_MEMORY=1`` or ``enable_memory()``. The recorded
+``mem_delta_kb`` is the change in memory traced across the whole process
+while the span ran, so allocations by other sessions' threads count too.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+WINDOW = int(os.environ.get("THAI_ELECTION_PROFILE_WINDOW", "500"))
+
+log = logging.getLogger("thai_election.perf")
+if os.environ.get("THAI_ELECTION_PERF_LOG"):
+    # JSON lines, one span per line, e.g. for shipping to a log pipeline
+    _handler = logging.FileHandler(os.environ["THAI_ELECTION_PERF_LOG"], encoding="utf-8")
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(_handler)
+    log.setLevel(logging.INFO)
+
+_lock = threading.Lock()
+_records = defaultdict(lambda: deque(maxlen=WINDOW))
+
+
+def enable_memory():
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+if os.environ.get("THAI_ELECTION_PROFILE_MEMORY") == "1":
+    enable_memory()
+
+
+def _rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Span:
+    """One timed stage; use as a context manager or call ``end()``."""
+
+    def __init__(self, stage, **fields):
+        self.stage = stage
+        self.fields = fields
+        self.memory = tracemalloc.is_tracing()
+        self._mem_start = tracemalloc.get_traced_memory()[0] if self.memory else None
+        self._start = time.perf_counter()
+        self.duration_ms = None
+
+    def end(self):
+        if self.duration_ms is not None:
+            return self
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+        record = {"stage": self.stage, "ts": time.time(), "duration_ms": round(self.duration_ms, 3)}
+        if self.memory:
+            # Process-wide, see the module docstring
+            record["mem_delta_kb"] = round((tracemalloc.get_traced_memory()[0] - self._mem_start) / 1024, 1)
+        record.update(self.fields)
+        with _lock:
+            _records[self.stage].append(record)
+        if log.isEnabledFor(logging.INFO):
+            log.info(json.dumps(record, ensure_ascii=False))
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.end()
+        return False
+
+
+def span(stage, **fields):
+    return Span(stage, **fields)
+
+
+def records(stage=None):
+    with _lock:
+        if stage is not None:
+            return list(_records.get(stage, ()))
+        return [r for rs in _records.values() for r in rs]
+
+
+def stats():
+    """Per-stage count, p50/p95/max and last duration (ms) over the rolling window."""
+    import pandas as pd
+
+    with _lock:
+        snapshot = {stage: [r["duration_ms"] for r in rs] for stage, rs in _records.items() if rs}
+    rows = []
+    for stage, durations in sorted(snapshot.items()):
+        d = np.asarray(durations)
+        rows.append({
+            "Stage": stage,
+            "Count": len(d),
+            "p50 (ms)": np.percentile(d, 50),
+            "p95 (ms)": np.percentile(d, 95),
+            "Max (ms)": d.max(),
+            "Last (ms)": d[-1],
+        })
+    return pd.DataFrame(rows, columns=["Stage", "Count", "p50 (ms)", "p95 (ms)", "Max (ms)", "Last (ms)"])
+
+
+def export_json():
+    """All retained span records plus process RSS, as a JSON string."""
+    return json.dumps({"rss_mb": _rss_mb(), "spans": records()}, ensure_ascii=False)
+
+
+def reset():
+    with _lock:
+        _records.clear()
+
+
+def render_panel():
+    """Sidebar "Performance" panel, shown only when the URL has ``?perf=1``."""
+    import streamlit as st
+
+    if st.query_params.get("perf") != "1":
+        return
+    with st.sidebar.expander("⏱️ Performance", expanded=True):
+        rss = _rss_mb()
+        if rss is not None:
+            st.caption(f"Process peak RSS: {rss:,.0f} MB · window: last {WINDOW} runs per stage")
+        st.dataframe(
+            stats().style.format({c: "{:.1f}" for c in ["p50 (ms)", "p95 (ms)", "Max (ms)", "Last (ms)"]}),
+            hide_index=True,
+            width="stretch",
+        )
+        st.download_button("Download spans (JSON)", export_json(), file_name="perf_spans.json",
+                           mime="application/json")
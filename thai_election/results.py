@@ -0,0 +1,44 @@
+"""Seat calculations shared by the pages: party-list allocation and the seat summary."""
+import numpy as np
+import pandas as pd
+
+from thai_election.allocation import allocate, hare_quotients
+from thai_election.loader import NO_INFO
+
+
+def district_winners(votes, parties):
+    """Winner name per row of a votes matrix (``NO_INFO`` when nobody has a vote yet)."""
+    if len(parties) == 0:
+        return np.full(len(votes), NO_INFO, dtype=object)
+    best = votes.argmax(axis=1)
+    return np.where(votes.max(axis=1) > 0, np.asarray(parties, dtype=object)[best], NO_INFO)
+
+
+def party_list_table(total_party_votes, seats=100):
+    """Largest Remainder Method with a Hare quota, one row per party."""
+    pl_calc = pd.DataFrame({
+        "Total Votes": total_party_votes,
+    })
+    votes = pl_calc["Total Votes"].to_numpy(dtype=float)
+    if votes.sum() > 0:
+        quotient, base, remainder = hare_quotients(votes[None, :], seats)
+        final = allocate(votes, seats, method="hare")
+        pl_calc["Quotient"] = quotient[0]
+        pl_calc["Base Seats"] = base[0]
+        pl_calc["Remainder"] = remainder[0]
+        # Parties whose remainder earned them one of the leftover seats
+        pl_calc["Extra Seat"] = final - base[0]
+        pl_calc["Final PL Seats"] = final
+    else:
+        pl_calc["Final PL Seats"] = 0
+    return pl_calc
+
+
+def seat_summary(constituency_winners, pl_calc):
+    """Constituency, list and total seats per party, largest first."""
+    summary = pd.DataFrame({
+        "Constituency Seats": constituency_winners,
+        "Party List": pl_calc["Final PL Seats"]
+    }).fillna(0).astype(int)
+    summary["Total"] = summary["Constituency Seats"] + summary["Party List"]
+    return summary[summary["Total"] > 0].sort_values("Total", ascending=False)
@@ -0,0 +1,91 @@
+"""Votes and seats rolled up by Region x Province x party.
+
+The cube keeps one row per (Region, Province) group and one column per
+party (seats get an extra ``NO_INFO`` column for districts without votes).
+``ResultEngine`` adds and subtracts individual constituency rows as they
+change, so national, regional and provincial views read the aggregates
+directly instead of grouping the whole Province sheet on every rerun.
+
+A cube published in an ``EngineResult`` is never modified again: the
+engine updates a ``copy()`` and publishes that, so readers only use the
+query methods.
+"""
+import numpy as np
+import pandas as pd
+
+from thai_election.loader import NO_INFO
+
+LEVELS = ("Region", "Province (English)")
+
+
+class RollupCube:
+    """Running sums of constituency votes and seats per (Region, Province) group."""
+
+    def __init__(self, parties):
+        self.parties = list(parties)
+        self.labels = pd.Index(self.parties + [NO_INFO])
+        self.groups = pd.MultiIndex.from_arrays([[], []], names=LEVELS)
+        self.votes = np.zeros((0, len(self.parties)))
+        self.seats = np.zeros((0, len(self.labels)), dtype=np.int64)
+
+    def copy(self):
+        cube = RollupCube.__new__(RollupCube)
+        cube.parties, cube.labels, cube.groups = self.parties, self.labels, self.groups
+        cube.votes, cube.seats = self.votes.copy(), self.seats.copy()
+        return cube
+
+    def group_codes(self, regions, provinces):
+        """Group row for each (region, province) pair, creating rows for new groups."""
+        keys = pd.MultiIndex.from_arrays(
+            [pd.Index(regions, dtype=object).fillna(""), pd.Index(provinces, dtype=object).fillna("")],
+            names=LEVELS,
+        )
+        codes = self.groups.get_indexer(keys)
+        missing = codes < 0
+        if missing.any():
+            new = keys[missing].unique()
+            self.groups = self.groups.append(new)
+            self.votes = np.vstack([self.votes, np.zeros((len(new), self.votes.shape[1]))])
+            self.seats = np.vstack([self.seats, np.zeros((len(new), self.seats.shape[1]), dtype=np.int64)])
+            codes[missing] = self.groups.get_indexer(keys[missing])
+        return codes
+
+    def add(self, codes, votes, winners, sign=1):
+        """Add (``sign=1``) or remove (``sign=-1``) constituency rows."""
+        if not len(codes):
+            return
+        np.add.at(self.votes, codes, sign * votes)
+        np.add.at(self.seats, (codes, self.labels.get_indexer(winners)), sign)
+
+    def _frame(self, values, columns, by):
+        frame = pd.DataFrame(values, index=self.groups, columns=columns)
+        if by == "province":
+            return frame
+        if by == "region":
+            return frame.groupby(level="Region", sort=True).sum()
+        if by == "national":
+            return frame.sum().to_frame("Total").T
+        raise ValueError(f"Unknown rollup level {by!r}; expected 'province', 'region' or 'national'")
+
+    def votes_by(self, by="region"):
+        """Constituency votes per party at ``by`` ("province", "region" or "national")."""
+        return self._frame(self.votes, self.parties, by)
+
+    def seats_by(self, by="region", include_undeclared=True):
+        """Constituency seats won per party at ``by``; ``NO_INFO`` counts undeclared districts."""
+        frame = self._frame(self.seats, self.labels, by)
+        return frame if include_undeclared else frame.drop(columns=NO_INFO)
+
+    def vote_share(self, by="region"):
+        """Share of the constituency vote per party at ``by`` (rows sum to 1)."""
+        votes = self.votes_by(by)
+        total = votes.sum(axis=1)
+        return votes.div(total.where(total > 0), axis=0).fillna(0.0)
+
+    def province(self, province):
+        """``(votes, seats)`` Series for one province, or ``None`` if it is unknown."""
+        rows = self.groups.get_level_values("Province (English)") == province
+        if not rows.any():
+            return None
+        return (pd.Series(self.votes[rows].sum(axis=0), index=self.parties),
+                pd.Series(self.seats[rows].sum(axis=0), index=self.labels))
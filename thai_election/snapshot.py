@@ -0,0 +1,117 @@
+"""Columnar (Arrow/Feather) copies of the workbook sheets.
+
+Parsing the xlsx with openpyxl dominates cold start, so each sheet is written
+once to an uncompressed Feather file and later loads memory-map that instead.
+The copy is keyed by the workbook's mtime and SHA-256; the xlsx is only parsed
+again when its content actually changes.
+
+Pre-build at deploy time with::
+
+    python -m thai_election.snapshot
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from thai_election.loader import ROOT, SHEETS, WORKBOOK
+
+CACHE_DIR = Path(os.environ.get("THAI_ELECTION_CACHE_DIR", ROOT / ".cache"))
+MANIFEST = "manifest.json"
+
+_lock = threading.Lock()
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - pyarrow ships with streamlit
+    feather = None
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _sheet_dir(workbook, cache_dir):
+    return Path(cache_dir) / "sheets" / Path(workbook).stem
+
+
+def _sheet_file(sheet):
+    return sheet.replace(" ", "_") + ".feather"
+
+
+def _read_manifest(sheet_dir):
+    try:
+        return json.loads((sheet_dir / MANIFEST).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic(path, write):
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def build(workbook=WORKBOOK, cache_dir=CACHE_DIR, force=False):
+    """Make sure the columnar copy of ``workbook`` is current; return its directory."""
+    workbook = Path(workbook)
+    sheet_dir = _sheet_dir(workbook, cache_dir)
+    with _lock:
+        stat = workbook.stat()
+        manifest = _read_manifest(sheet_dir)
+        files_ok = manifest is not None and all(
+            (sheet_dir / f).exists() for f in manifest.get("sheets", {}).values()
+        ) and set(manifest.get("sheets", {})) == set(SHEETS)
+        if not force and files_ok and manifest["mtime_ns"] == stat.st_mtime_ns and manifest["size"] == stat.st_size:
+            return sheet_dir
+
+        digest = file_sha256(workbook)
+        if not force and files_ok and manifest["sha256"] == digest:
+            # Touched but unchanged (e.g. re-copied on deploy): just re-key it.
+            manifest.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        else:
+            sheet_dir.mkdir(parents=True, exist_ok=True)
+            sheets = {}
+            with pd.ExcelFile(workbook) as xlsx:
+                for sheet, (_, header) in SHEETS.items():
+                    df = pd.read_excel(xlsx, header=header, sheet_name=sheet)
+                    sheets[sheet] = _sheet_file(sheet)
+                    _write_atomic(
+                        sheet_dir / sheets[sheet],
+                        lambda tmp, df=df: feather.write_feather(df, tmp, compression="uncompressed"),
+                    )
+            manifest = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest, "sheets": sheets}
+        _write_atomic(sheet_dir / MANIFEST, lambda tmp: tmp.write_text(json.dumps(manifest, indent=2)))
+        return sheet_dir
+
+
+def read_sheet(sheet, workbook=WORKBOOK, cache_dir=CACHE_DIR):
+    """Read ``sheet`` of ``workbook`` from its columnar copy, rebuilding it if stale."""
+    if feather is None:
+        _, header = SHEETS[sheet]
+        return pd.read_excel(workbook, header=header, sheet_name=sheet)
+    sheet_dir = build(workbook, cache_dir)
+    table = feather.read_table(sheet_dir / _sheet_file(sheet), memory_map=True)
+    return table.to_pandas()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-build the columnar cache of the election workbook.")
+    parser.add_argument("--workbook", default=WORKBOOK, type=Path)
+    parser.add_argument("--cache-dir", default=CACHE_DIR, type=Path)
+    parser.add_argument("--force", action="store_true", help="rebuild even if the cache looks current")
+    args = parser.parse_args(argv)
+    sheet_dir = build(args.workbook, args.cache_dir, force=args.force)
+    print(f"Columnar cache ready in {sheet_dir}")
+
+
+if __name__ == "__main__":
+    main()
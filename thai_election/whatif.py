@@ -0,0 +1,144 @@
+"""Swing / what-if scenarios recomputed in a few milliseconds.
+
+A swing moves ``points`` percentage points of each district's vote from
+one party to another (never more than the losing party actually has),
+either nationally or per ``Region``. The same swing is applied to the
+constituency and party-list votes, after which all 400 winners, the
+largest-remainder list seats and the hemicycle seat order are recomputed
+with NumPy on the shared ``ElectionModel`` arrays -- no DataFrames on the
+way, so the page can rerun on every slider move.
+"""
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from thai_election.allocation import allocate
+from thai_election.loader import NO_INFO
+from thai_election.parliament import seat_geometry
+
+_lock = threading.Lock()
+_bases = weakref.WeakKeyDictionary()  # ElectionModel -> SwingBase
+
+
+class WhatIfResult:
+    """Seats under one scenario; ``winner`` is -1 where no votes are in."""
+
+    def __init__(self, parties, winner, base_winner, constituency_seats, list_seats):
+        self.parties = parties
+        self.winner = winner
+        self.flipped = winner != base_winner
+        self.constituency_seats = constituency_seats
+        self.list_seats = list_seats
+        self.undeclared = int((winner < 0).sum())
+        self.total_seats = constituency_seats + list_seats
+
+    def order(self):
+        """Party indices by total seats, largest first (ties keep sheet order)."""
+        return np.argsort(-self.total_seats, kind="stable")
+
+    def seat_parties(self, n_seats=500, rows=10, radius=10):
+        """``(x, y, labels)`` for the hemicycle, parties in ``order()``.
+
+        Undeclared districts fill the last seats as ``NO_INFO``.
+        """
+        order = self.order()
+        counts = self.total_seats[order]
+        labels = np.repeat(np.asarray(self.parties, dtype=object)[order], counts)
+        labels = np.concatenate([labels, np.full(self.undeclared, NO_INFO, dtype=object)])
+        x, y = seat_geometry(max(n_seats, len(labels)), rows, radius)
+        return x[:len(labels)], y[:len(labels)], labels
+
+    def summary(self):
+        """Small per-party table for display (parties with at least one seat).
+
+        Undeclared districts are listed last as ``NO_INFO``.
+        """
+        order = self.order()
+        table = pd.DataFrame({
+            "Constituency Seats": self.constituency_seats[order],
+            "Party List": self.list_seats[order],
+            "Total": self.total_seats[order],
+        }, index=pd.Index(np.asarray(self.parties, dtype=object)[order], name="Party"))
+        table = table[table["Total"] > 0]
+        if self.undeclared:
+            table.loc[NO_INFO] = [self.undeclared, 0, self.undeclared]
+        return table
+
+
+class SwingBase:
+    """One snapshot's float vote matrices, ready for repeated swings.
+
+    The baseline and every scenario are computed from the same matrices as
+    the seat engine uses, so a zero swing reproduces its result exactly.
+    """
+
+    def __init__(self, model, list_seats=100, method="hare"):
+        self.parties = model.parties
+        self.constituency_ids = model.constituency_ids
+        self.regions = tuple(model.region.categories)
+        self.list_seats = list_seats
+        self.method = method
+        self._region = model.region.codes
+        self._list_region = model.list_region.codes
+        # The model's matrices are read-only; _swing works on copies
+        self._votes = model.votes
+        self._list_votes = model.list_votes
+        self._row_total = self._votes.sum(axis=1)
+        self._list_row_total = self._list_votes.sum(axis=1)
+        self.base_winner = self._winners(self._votes)
+        self.base = self.simulate()
+
+    def party_index(self, party):
+        return self.parties.index(party)
+
+    def _points(self, codes, national, by_region):
+        points = np.full(len(codes), float(national))
+        if by_region:
+            extra = np.zeros(len(self.regions) + 1)  # last slot: rows without a region
+            for region, value in by_region.items():
+                extra[self.regions.index(region)] = value
+            points += extra[codes]
+        return points / 100.0
+
+    @staticmethod
+    def _swing(votes, row_total, share, source, target):
+        moved = np.minimum(np.clip(share, 0, None) * row_total, votes[:, source])
+        # Negative points swing the other way, capped by the target's votes
+        back = np.minimum(np.clip(-share, 0, None) * row_total, votes[:, target])
+        delta = moved - back
+        votes = votes.copy()
+        votes[:, source] -= delta
+        votes[:, target] += delta
+        return votes
+
+    @staticmethod
+    def _winners(votes):
+        if not votes.shape[1]:
+            return np.full(len(votes), -1)
+        return np.where(votes.max(axis=1) > 0, votes.argmax(axis=1), -1)
+
+    def simulate(self, source=None, target=None, national=0.0, by_region=None):
+        """Seats after moving ``national`` (+ ``by_region[region]``) points from ``source`` to ``target``."""
+        votes, list_votes = self._votes, self._list_votes
+        if source is not None and target is not None and source != target:
+            source, target = self.party_index(source), self.party_index(target)
+            votes = self._swing(votes, self._row_total,
+                                self._points(self._region, national, by_region), source, target)
+            list_votes = self._swing(list_votes, self._list_row_total,
+                                     self._points(self._list_region, national, by_region), source, target)
+
+        winner = self._winners(votes)
+        constituency_seats = np.bincount(winner[winner >= 0], minlength=len(self.parties))
+        list_seats = allocate(list_votes.sum(axis=0), self.list_seats, method=self.method)
+        return WhatIfResult(self.parties, winner, self.base_winner, constituency_seats, np.asarray(list_seats))
+
+
+def swing_base(model):
+    """The ``SwingBase`` for ``model``, built once and shared while the model lives."""
+    with _lock:
+        base = _bases.get(model)
+        if base is None:
+            base = _bases[model] = SwingBase(model)
+        return base